@@ -68,9 +68,9 @@ def init_bot_commands():
         logger.exception("Failed to set bot commands: %s", e, extra={"src_module": "accounts", "operation": "init_bot_commands", "error": str(e)})
 
 
-def init_default_account():
+def init_default_account(snapshot: Optional[_db.PrefetchSnapshot] = None):
     """初始化預設帳號（如果不存在）"""
-    item = _db.safe_get_item(_get_accounts_table(), {'account_id': DEFAULT_ACCOUNT_ID})
+    item = _db.safe_get_item(_get_accounts_table(), {'account_id': DEFAULT_ACCOUNT_ID}, snapshot)
     if not item:
         _db.safe_put_item(_get_accounts_table(), {
             'account_id': DEFAULT_ACCOUNT_ID,
@@ -82,9 +82,9 @@ def init_default_account():
         })
 
 
-def get_account(account_id: str) -> Optional[dict]:
-    """取得帳號配置"""
-    return _db.safe_get_item(_get_accounts_table(), {'account_id': account_id})
+def get_account(account_id: str, snapshot: Optional[_db.PrefetchSnapshot] = None) -> Optional[dict]:
+    """取得帳號配置（snapshot: execute pipeline 預取結果）"""
+    return _db.safe_get_item(_get_accounts_table(), {'account_id': account_id}, snapshot)
 
 
 def list_accounts() -> list:
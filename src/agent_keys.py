@@ -124,12 +124,29 @@ def check_scope_authorization(agent: dict, command: str, account_id: str, risk_s
     return None
 
 
-def identify_agent(key: str, caller_ip: str = None) -> Optional[dict]:
+def prefetch_key(key: str) -> Optional[dict]:
+    """DynamoDB key identify_agent() would read for ``key``.
+
+    Returns None when no table read will be needed (malformed key or a
+    fresh cache entry), so the execute pipeline can skip prefetching it.
+    """
+    if not key or not key.startswith('bncr_'):
+        return None
+    key_hash = _hash_key(key)
+    with _cache_lock:
+        cached_entry = _key_cache.get(key_hash)
+        if cached_entry and time.time() - cached_entry[1] < _KEY_CACHE_TTL:
+            return None
+    return {'config_key': f"agent_key#{key_hash}"}
+
+
+def identify_agent(key: str, caller_ip: str = None, snapshot=None) -> Optional[dict]:
     """Identify agent by API key.
 
     Args:
         key: Full API key (bncr_...)
         caller_ip: Optional caller IP address (for last_ip tracking)
+        snapshot: Optional db.PrefetchSnapshot to serve the lookup from
 
     Returns:
         {agent_id, agent_name, scope, allowed_commands, allowed_accounts, max_risk_score} if valid,
@@ -154,7 +171,10 @@ def identify_agent(key: str, caller_ip: str = None) -> Optional[dict]:
     try:
         table = _get_table()
         pk = f"agent_key#{key_hash}"
-        response = table.get_item(Key={'config_key': pk})
+        if snapshot is not None:
+            response = snapshot.get_item(table, {'config_key': pk})
+        else:
+            response = table.get_item(Key={'config_key': pk})
         item = response.get('Item')
 
         if not item:
@@ -4,6 +4,7 @@ Bouncer - 命令分類與執行模組
 """
 from __future__ import annotations
 
+import functools
 import os
 import re
 import threading
@@ -15,6 +16,7 @@ from botocore.exceptions import ClientError
 from aws_lambda_powertools import Logger
 
 from constants import BLOCKED_PATTERNS, DANGEROUS_PATTERNS, AUTO_APPROVE_PREFIXES, DEFAULT_REGION
+from parsed_command import get_parsed_command
 
 logger = Logger(service="bouncer")
 
@@ -38,6 +40,10 @@ __all__ = [
     'LAMBDA_ENV_WARN_MSG',
     'CommandChainResult',
     'SubCommandResult',
+    'CommandClassifier',
+    'CommandVerdict',
+    'classify_command',
+    'get_command_classifier',
 ]
 
 
@@ -87,7 +93,8 @@ class CommandChainResult:
 
 def _normalize_whitespace(command: str) -> str:
     """正規化命令中的空白（多空格 → 單空格、strip 前後空白）"""
-    return re.sub(r'\s+', ' ', command).strip()
+    # str.split() 與 re '\s' 使用同一組 Unicode 空白字元，結果與 re.sub(r'\s+', ' ').strip() 相同
+    return ' '.join(command.split())
 
 
 def _split_chain(command: str) -> list[str]:
@@ -206,38 +213,26 @@ def is_blocked(command: str) -> bool:
 
 def get_block_reason(command: str) -> str | None:
     """檢查命令是否被封鎖，回傳封鎖原因或 None"""
-    cmd_normalized = _normalize_whitespace(command)
-    # 移除 --query 參數內容（JMESPath 語法可能包含反引號）
-    cmd_sanitized = re.sub(r"--query\s+['\"].*?['\"]", "--query REDACTED", cmd_normalized)
-    cmd_sanitized = re.sub(r"--query\s+[^\s'\"]+", "--query REDACTED", cmd_sanitized)
-    cmd_lower = cmd_sanitized.lower()
-    # 檢查危險旗標
-    flag = _get_blocked_flag(cmd_lower)
-    if flag:
-        return f"危險旗標: {flag.strip()}"
-    # 檢查 file:// 協議
-    if _has_file_protocol(cmd_lower):
-        return "禁止使用 file:// 或 fileb:// 協議（本地檔案讀取風險）"
-    # 特殊檢查：lambda update-function-configuration --environment Variables={}
-    level, reason = check_lambda_env_update(command)
-    if level == 'BLOCKED':
-        return reason
-    # 檢查封鎖 pattern
-    for pattern in BLOCKED_PATTERNS:
-        if pattern in cmd_lower:
-            return f"封鎖規則: {pattern}"
-    return None
+    return classify_command(command).block_reason
+
+
+# 危險的全域旗標（依序檢查，第一個命中者作為封鎖原因）
+_BLOCKED_FLAGS = (
+    '--endpoint-url ',   # 重定向 API 請求到外部
+    '--profile ',        # 切換到未授權的 AWS profile
+    '--no-verify-ssl',   # 禁用 SSL 驗證（MITM 風險）
+    '--ca-bundle ',      # 使用自訂 CA 證書
+)
+
+_QUERY_QUOTED_RE = re.compile(r"--query\s+['\"].*?['\"]")
+_QUERY_BARE_RE = re.compile(r"--query\s+[^\s'\"]+")
+_LAMBDA_ENV_VARIABLES_RE = re.compile(r'variables\s*=\s*(\{[^}]*\})')
+_EMPTY_OBJECT_RE = re.compile(r'^\{\s*\}$')
 
 
 def _get_blocked_flag(cmd_lower: str) -> str | None:
     """檢查命令是否包含危險的全域旗標，回傳匹配的旗標或 None"""
-    blocked_flags = [
-        '--endpoint-url ',   # 重定向 API 請求到外部
-        '--profile ',        # 切換到未授權的 AWS profile
-        '--no-verify-ssl',   # 禁用 SSL 驗證（MITM 風險）
-        '--ca-bundle ',      # 使用自訂 CA 證書
-    ]
-    for flag in blocked_flags:
+    for flag in _BLOCKED_FLAGS:
         if flag in cmd_lower:
             return flag
     return None
@@ -269,8 +264,12 @@ def check_lambda_env_update(command: str) -> tuple[str | None, str | None]:
           - 'DANGEROUS': --environment Variables={...} (有值但會覆蓋)
           - None: 命令不符合此 pattern
     """
-    cmd_lower = _normalize_whitespace(command).lower()
+    verdict = classify_command(command)
+    return verdict.lambda_env_level, verdict.lambda_env_message
+
 
+def _lambda_env_update_level(cmd_lower: str) -> tuple[str | None, str | None]:
+    """check_lambda_env_update 的實作，輸入為已正規化並轉小寫的命令。"""
     # 必須是 lambda update-function-configuration
     if 'lambda update-function-configuration' not in cmd_lower:
         return None, None
@@ -280,15 +279,12 @@ def check_lambda_env_update(command: str) -> tuple[str | None, str | None]:
         return None, None
 
     # 找出 Variables={...} 的部分
-    # 使用 re 找 Variables= 後面的 JSON-like 值
-    # 可以是 Variables={} 或 Variables={"KEY":"VALUE",...}
-    import re
-    # 抓取 Variables=... 的部分（可能有空格）
-    match = re.search(r'variables\s*=\s*(\{[^}]*\})', cmd_lower)
+    # 可以是 Variables={} 或 Variables={"KEY":"VALUE",...}（可能有空格）
+    match = _LAMBDA_ENV_VARIABLES_RE.search(cmd_lower)
     if match:
         variables_value = match.group(1).strip()
         # {} 或空的 JSON object → BLOCKED
-        if variables_value == '{}' or re.match(r'^\{\s*\}$', variables_value):
+        if variables_value == '{}' or _EMPTY_OBJECT_RE.match(variables_value):
             return 'BLOCKED', '此命令會清空所有環境變數（Variables={}）！這是破壞性操作，已被封鎖。'
         else:
             # 有值的 --environment Variables={...} → DANGEROUS
@@ -299,14 +295,7 @@ def check_lambda_env_update(command: str) -> tuple[str | None, str | None]:
 
 def is_dangerous(command: str) -> bool:
     """Layer 2: 檢查命令是否是高危操作（需特殊審批）"""
-    cmd_lower = _normalize_whitespace(command).lower()
-
-    # 特殊檢查：lambda update-function-configuration --environment
-    level, _ = check_lambda_env_update(command)
-    if level == 'DANGEROUS':
-        return True
-
-    return any(pattern in cmd_lower for pattern in DANGEROUS_PATTERNS)
+    return classify_command(command).dangerous
 
 
 def _is_safe_s3_cp(command: str) -> bool:
@@ -384,21 +373,144 @@ def _has_dangerous_flag(cmd_lower: str, matched_prefix: str) -> bool:
 
 def is_auto_approve(command: str) -> bool:
     """Layer 3: 檢查命令是否可自動批准"""
-    cmd_lower = _normalize_whitespace(command).lower()
-    matched = next((prefix for prefix in AUTO_APPROVE_PREFIXES if cmd_lower.startswith(prefix)), None)
-    if matched is None:
-        return False
+    return classify_command(command).auto_approve
 
-    # P1-4 安全修復：aws s3 cp s3: 前綴匹配時，進一步檢查
-    # 是否為 S3→S3 copy（cross-bucket exfiltration 風險）
-    if cmd_lower.startswith('aws s3 cp s3:'):
-        return _is_safe_s3_cp(command)
 
-    # P1-5 安全修復：即使前綴在白名單，若命令含有危險旗標，仍需人工審批
-    if _has_dangerous_flag(cmd_lower, matched):
-        return False
+# ---------------------------------------------------------------------------
+# Compiled classifier
+# ---------------------------------------------------------------------------
 
-    return True
+@dataclass(frozen=True)
+class CommandVerdict:
+    """Classification verdict for a single command.
+
+    Attributes:
+        block_reason:       封鎖原因（None = 未封鎖），與 get_block_reason 相同
+        dangerous:          是否為高危操作，與 is_dangerous 相同
+        auto_approve:       是否可自動批准，與 is_auto_approve 相同
+        lambda_env_level:   check_lambda_env_update 的 level
+        lambda_env_message: check_lambda_env_update 的 message
+    """
+    block_reason: Optional[str]
+    dangerous: bool
+    auto_approve: bool
+    lambda_env_level: Optional[str] = None
+    lambda_env_message: Optional[str] = None
+
+    @property
+    def blocked(self) -> bool:
+        return self.block_reason is not None
+
+
+class CommandClassifier:
+    """Blocked / dangerous / auto-approve classifier compiled once per container.
+
+    All three verdicts come from one whitespace normalization and one
+    lower-casing of the command; the ``--query`` redaction only runs when the
+    command actually contains ``--query``.  Auto-approve prefixes are compiled
+    into a single anchored alternation (a backtracking prefix trie inside
+    ``re``), so prefix lookup no longer walks the list in Python.  Substring
+    patterns stay as C-level ``in`` tests over frozen tuples: with a few dozen
+    literals that is cheaper than a combined regex or a pure-Python
+    Aho-Corasick scan, and it keeps first-match-in-list-order semantics for
+    block reasons.
+    """
+
+    def __init__(
+        self,
+        blocked_patterns=BLOCKED_PATTERNS,
+        dangerous_patterns=DANGEROUS_PATTERNS,
+        auto_approve_prefixes=AUTO_APPROVE_PREFIXES,
+        blocked_flags=_BLOCKED_FLAGS,
+        dangerous_flag_map=None,
+    ):
+        self.blocked_patterns = tuple(blocked_patterns)
+        self.dangerous_patterns = tuple(dangerous_patterns)
+        self.blocked_flags = tuple(blocked_flags)
+        flag_map = _DANGEROUS_FLAG_MAP if dangerous_flag_map is None else dangerous_flag_map
+        self.dangerous_flag_map = tuple((prefix, tuple(flags)) for prefix, flags in flag_map.items())
+        prefixes = tuple(auto_approve_prefixes)
+        self._auto_approve_re = (
+            re.compile('|'.join(re.escape(p) for p in prefixes)) if prefixes else None
+        )
+
+    def classify(self, command: str) -> CommandVerdict:
+        """Classify a raw command string (same semantics as the Layer 1-3 functions)."""
+        cmd_normalized = _normalize_whitespace(command)
+        cmd_lower = cmd_normalized.lower()
+        lambda_level, lambda_msg = _lambda_env_update_level(cmd_lower)
+
+        return CommandVerdict(
+            block_reason=self._block_reason(cmd_normalized, cmd_lower, lambda_level, lambda_msg),
+            dangerous=lambda_level == 'DANGEROUS' or any(p in cmd_lower for p in self.dangerous_patterns),
+            auto_approve=self._auto_approve(command, cmd_lower),
+            lambda_env_level=lambda_level,
+            lambda_env_message=lambda_msg,
+        )
+
+    def _block_reason(self, cmd_normalized: str, cmd_lower: str,
+                      lambda_level: Optional[str], lambda_msg: Optional[str]) -> Optional[str]:
+        # 移除 --query 參數內容（JMESPath 語法可能包含反引號）
+        if '--query' in cmd_normalized:
+            cmd_sanitized = _QUERY_QUOTED_RE.sub("--query REDACTED", cmd_normalized)
+            cmd_sanitized = _QUERY_BARE_RE.sub("--query REDACTED", cmd_sanitized)
+            sanitized_lower = cmd_sanitized.lower()
+        else:
+            sanitized_lower = cmd_lower
+
+        # 檢查危險旗標
+        for flag in self.blocked_flags:
+            if flag in sanitized_lower:
+                return f"危險旗標: {flag.strip()}"
+        # 檢查 file:// 協議
+        if _has_file_protocol(sanitized_lower):
+            return "禁止使用 file:// 或 fileb:// 協議（本地檔案讀取風險）"
+        # 特殊檢查：lambda update-function-configuration --environment Variables={}
+        if lambda_level == 'BLOCKED':
+            return lambda_msg
+        # 檢查封鎖 pattern
+        for pattern in self.blocked_patterns:
+            if pattern in sanitized_lower:
+                return f"封鎖規則: {pattern}"
+        return None
+
+    def _auto_approve(self, command: str, cmd_lower: str) -> bool:
+        if self._auto_approve_re is None or self._auto_approve_re.match(cmd_lower) is None:
+            return False
+
+        # P1-4 安全修復：aws s3 cp s3: 前綴匹配時，進一步檢查
+        # 是否為 S3→S3 copy（cross-bucket exfiltration 風險）
+        if cmd_lower.startswith('aws s3 cp s3:'):
+            return _is_safe_s3_cp(command)
+
+        # P1-5 安全修復：即使前綴在白名單，若命令含有危險旗標，仍需人工審批
+        for prefix, flags in self.dangerous_flag_map:
+            if cmd_lower.startswith(prefix) and any(flag in cmd_lower for flag in flags):
+                return False
+
+        return True
+
+
+_classifier: Optional[CommandClassifier] = None
+
+
+def get_command_classifier() -> CommandClassifier:
+    """Return the warm-container classifier (built on first use)."""
+    global _classifier
+    if _classifier is None:
+        _classifier = CommandClassifier()
+    return _classifier
+
+
+@functools.lru_cache(maxsize=1024)
+def classify_command(command: str) -> CommandVerdict:
+    """Classify a command once; repeated checks on the same string hit the cache.
+
+    The execute pipeline asks for the block reason, the auto-approve verdict
+    and the dangerous flag of the same command in different layers — the
+    cache turns those into a single scan per request.
+    """
+    return get_command_classifier().classify(command)
 
 
 def _parse_quoted_string(command: str, i: int, quote: str) -> tuple[str, int]:
@@ -480,7 +592,14 @@ def _parse_brackets(command: str, i: int, open_char: str, close_map: dict) -> tu
 
 def aws_cli_split(command: str) -> list:
     """
-    把 AWS CLI 命令字串拆成 argv list。
+    把 AWS CLI 命令字串拆成 argv list（tokens 經 ParsedCommandCache 共用，回傳副本）。
+    """
+    return list(get_parsed_command(command).tokens)
+
+
+def _split_aws_cli(command: str) -> list:
+    """
+    aws_cli_split 的實作：把 AWS CLI 命令字串拆成 argv list。
 
     不依賴 shell 語法（shlex），理解 AWS CLI 常見結構：
     - 引號字串："..." 或 '...'（去引號，空引號 → 空字串 token）
@@ -35,12 +35,13 @@ def _get_table():
     return _ddb_table
 
 
-def get_config(key: str, default=None):
+def get_config(key: str, default=None, snapshot=None):
     """Get config value. Returns default if not found. Uses memory cache with TTL.
 
     Args:
         key: Config key to retrieve
         default: Default value if key not found
+        snapshot: Optional db.PrefetchSnapshot to serve a cache miss from
 
     Returns:
         Config value (can be any JSON-serializable type), or default if not found
@@ -57,7 +58,10 @@ def get_config(key: str, default=None):
     # Cache miss or expired — fetch from DynamoDB
     try:
         table = _get_table()
-        response = table.get_item(Key={'config_key': key})
+        if snapshot is not None:
+            response = snapshot.get_item(table, {'config_key': key})
+        else:
+            response = table.get_item(Key={'config_key': key})
         item = response.get('Item')
         if not item:
             logger.debug("Config key not found: %s", key, extra={"src_module": "config_store", "operation": "get_config", "key": key})
@@ -125,7 +129,14 @@ def list_configs():
         return []
 
 
-def _is_silent_source(source: str) -> bool:
+def is_cached(key: str) -> bool:
+    """True if ``key`` has an unexpired entry in the memory cache."""
+    with _cache_lock:
+        cached_entry = _cache.get(key)
+        return bool(cached_entry) and time.time() - cached_entry[1] < _CACHE_TTL
+
+
+def _is_silent_source(source: str, snapshot=None) -> bool:
     """Check if source matches any pattern in silent_sources config.
 
     Patterns support trailing * wildcard (prefix match).
@@ -133,11 +144,12 @@ def _is_silent_source(source: str) -> bool:
 
     Args:
         source: Request source identifier
+        snapshot: Optional db.PrefetchSnapshot (see ``get_config``)
 
     Returns:
         True if source matches a silent pattern, False otherwise
     """
-    patterns = get_config('silent_sources', [])
+    patterns = get_config('silent_sources', [], snapshot=snapshot)
     if not patterns or not source:
         return False
 
@@ -171,6 +171,24 @@ RATE_LIMIT_MAX_REQUESTS = 5  # 每視窗最多 5 個審批請求
 MAX_PENDING_PER_SOURCE = 10  # 每 source 最多 10 個 pending
 RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
 
+# Rate limit backend:
+#   'counter' — 每 source 每視窗一個計數 item，單次 conditional UpdateItem（O(1)）
+#   'query'   — 舊版：source-created-index GSI COUNT 查詢（成本隨歷史成長）
+RATE_LIMIT_MODE_COUNTER = 'counter'
+RATE_LIMIT_MODE_QUERY = 'query'
+RATE_LIMIT_MODE = os.environ.get('RATE_LIMIT_MODE', RATE_LIMIT_MODE_COUNTER).lower()
+# counter 模式下 pending 查詢只回看此時間範圍（遠長於任何審批視窗；
+# 受 rate limit 限制，最多讀取 RATE_LIMIT_PENDING_LOOKBACK / RATE_LIMIT_WINDOW * RATE_LIMIT_MAX_REQUESTS 筆）
+RATE_LIMIT_PENDING_LOOKBACK = TTL_1_HOUR
+RATE_LIMIT_COUNTER_PREFIX = 'ratelimit#'
+
+# ============================================================================
+# Parsed Command Cache - 命令解析結果共用（warm container 內）
+# ============================================================================
+
+PARSE_CACHE_MAX_ENTRIES = 512  # LRU 上限（命令數）
+PARSE_CACHE_MAX_COMMAND_LENGTH = 16_384  # 超過此長度的命令不進快取（避免大型 payload 佔用記憶體）
+
 # ============================================================================
 # Deploy Mode
 # ============================================================================
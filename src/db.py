@@ -78,6 +78,8 @@ def reset_tables():
     deployer_history_table._reset()
     deployer_locks_table._reset()
     sequence_history_table._reset()
+    global _resource
+    _resource = None
 
 
 # DDB operation helpers — reduce boilerplate for common patterns
@@ -101,18 +103,19 @@ def safe_put_item(table_ref, item: dict, **kwargs) -> bool:
         return False
 
 
-def safe_get_item(table_ref, key: dict) -> dict | None:
+def safe_get_item(table_ref, key: dict, snapshot: PrefetchSnapshot | None = None) -> dict | None:
     """Get item with standardized error handling.
 
     Args:
         table_ref: DynamoDB table object or _LazyTable reference
         key: Key dict for get_item
+        snapshot: Optional PrefetchSnapshot to serve the read from
 
     Returns:
         Item dict if found, None if not found or on error
     """
     try:
-        response = table_ref.get_item(Key=key)
+        response = read_item(table_ref, key, snapshot)
         return response.get('Item')
     except ClientError as e:
         logger.exception("DDB get_item failed: %s", e)
@@ -154,3 +157,113 @@ def safe_update_item(
     except ClientError as e:
         logger.exception("DDB update_item failed: %s", e)
         return False
+
+
+# Request-scoped prefetch — one BatchGetItem round trip for the execute pipeline
+
+_BATCH_GET_MAX_ATTEMPTS = 3
+
+_resource = None
+
+
+def _get_resource():
+    global _resource
+    if _resource is None:
+        _resource = boto3.resource('dynamodb', region_name=DEFAULT_REGION)
+    return _resource
+
+
+def _key_id(table_name, key: dict) -> tuple:
+    return (table_name, tuple(sorted(key.items())))
+
+
+class PrefetchSnapshot:
+    """Items fetched up front via a single BatchGetItem, keyed by table + key.
+
+    ``get_item`` mirrors ``Table.get_item`` (returns ``{'Item': ...}``) so
+    readers can swap it in without changing their response handling.  Keys
+    that were not part of the batch — or the whole batch if it failed —
+    fall through to a regular ``get_item`` on the table.
+    """
+
+    def __init__(self):
+        self._fetched = set()
+        self._items = {}
+
+    def __len__(self):
+        return len(self._fetched)
+
+    def record(self, table_name, key: dict, item: dict | None) -> None:
+        kid = _key_id(table_name, key)
+        self._fetched.add(kid)
+        if item is not None:
+            self._items[kid] = item
+
+    def get_item(self, table_ref, key: dict) -> dict:
+        kid = _key_id(table_ref.name, key)
+        if kid in self._fetched:
+            item = self._items.get(kid)
+            return {'Item': item} if item is not None else {}
+        return table_ref.get_item(Key=key)
+
+
+def read_item(table_ref, key: dict, snapshot: PrefetchSnapshot | None = None) -> dict:
+    """``table_ref.get_item(Key=key)``, served from ``snapshot`` when prefetched."""
+    if snapshot is not None:
+        return snapshot.get_item(table_ref, key)
+    return table_ref.get_item(Key=key)
+
+
+def batch_prefetch(requests: list) -> PrefetchSnapshot:
+    """Fetch ``[(table_ref, key), ...]`` in one BatchGetItem call.
+
+    Duplicate keys are collapsed and ``UnprocessedKeys`` are retried a few
+    times; anything still unprocessed is simply left out of the snapshot so
+    the reader falls back to its own ``get_item``.  Never raises — on error
+    an empty snapshot is returned.
+    """
+    snapshot = PrefetchSnapshot()
+    request_items = {}
+    seen = set()
+    try:
+        for table_ref, key in requests:
+            table_name = table_ref.name
+            if not isinstance(table_name, str):
+                continue  # not a real DynamoDB table (e.g. test double)
+            kid = _key_id(table_name, key)
+            if kid in seen:
+                continue
+            seen.add(kid)
+            request_items.setdefault(table_name, {'Keys': []})['Keys'].append(key)
+        if not request_items:
+            return snapshot
+
+        pending = request_items
+        for _ in range(_BATCH_GET_MAX_ATTEMPTS):
+            response = _get_resource().batch_get_item(RequestItems=pending)
+            found = {}
+            for table_name, items in response.get('Responses', {}).items():
+                for item in items:
+                    found.setdefault(table_name, []).append(item)
+            unprocessed = response.get('UnprocessedKeys') or {}
+            for table_name, spec in pending.items():
+                skipped = {
+                    _key_id(table_name, k)
+                    for k in unprocessed.get(table_name, {}).get('Keys', [])
+                }
+                for key in spec['Keys']:
+                    if _key_id(table_name, key) in skipped:
+                        continue
+                    match = next(
+                        (i for i in found.get(table_name, [])
+                         if all(i.get(k) == v for k, v in key.items())),
+                        None,
+                    )
+                    snapshot.record(table_name, key, match)
+            if not unprocessed:
+                break
+            pending = unprocessed
+    except Exception as e:  # noqa: BLE001 — prefetch is an optimisation; readers fall back
+        logger.warning("DDB batch prefetch failed, falling back to get_item: %s", e)
+        return PrefetchSnapshot()
+    return snapshot
@@ -14,6 +14,8 @@ from accounts import (
     validate_account_id,
 )
 from constants import DEFAULT_ACCOUNT_ID, MCP_MAX_WAIT
+from db import PrefetchSnapshot
+from parsed_command import get_parsed_command
 
 
 # =============================================================================
@@ -33,14 +35,21 @@ _UNICODE_SPACE_RE = re.compile(
 
 def _normalize_command(cmd: str) -> str:
     """
-    SEC-003: 正規化命令字串，防止 Unicode 注入繞過：
+    SEC-003: 正規化命令字串，防止 Unicode 注入繞過（結果經 ParsedCommandCache 共用）
+    """
+    if not cmd:
+        return cmd
+    return get_parsed_command(cmd).normalized
+
+
+def _normalize_unicode(cmd: str) -> str:
+    """
+    SEC-003 正規化實作：
     1. 移除零寬 / 不可見字元
     2. 替換 Unicode 空白為普通空白
     3. 折疊多餘空白
     4. strip 前後空白
     """
-    if not cmd:
-        return cmd
     # 1. 移除不可見字元
     cmd = _INVISIBLE_CHARS_RE.sub('', cmd)
     # 2. Unicode 空白 → 普通空白
@@ -83,13 +92,18 @@ class ExecuteContext:
     verified_identity: bool = False  # True if source was set by server via API key
     # Warnings for unknown parameters (#414)
     warnings: Optional[list] = None  # List of warning messages for unknown parameters
+    # Request-scoped DynamoDB prefetch (execute_pipeline._prefetch_state)
+    prefetched: Optional[PrefetchSnapshot] = None
 
 
-def _parse_execute_request(req_id, arguments: dict) -> 'dict | ExecuteContext':
+def _parse_execute_request(
+    req_id, arguments: dict, prefetched: Optional[PrefetchSnapshot] = None,
+) -> 'dict | ExecuteContext':
     """Parse and validate execute request arguments.
 
     Returns an ExecuteContext on success, or an MCP error/result dict on
-    validation failure (caller should return immediately).
+    validation failure (caller should return immediately).  Account reads
+    are served from ``prefetched`` when given.
     """
     import json
 
@@ -135,7 +149,7 @@ def _parse_execute_request(req_id, arguments: dict) -> 'dict | ExecuteContext':
         })
 
     # 初始化預設帳號
-    init_default_account()
+    init_default_account(prefetched)
 
     # 解析帳號配置
     if account_id:
@@ -146,7 +160,7 @@ def _parse_execute_request(req_id, arguments: dict) -> 'dict | ExecuteContext':
                 'isError': True
             })
 
-        account = get_account(account_id)
+        account = get_account(account_id, prefetched)
         if not account:
             available = [a['account_id'] for a in list_accounts()]
             return mcp_result(req_id, {
@@ -175,7 +189,7 @@ def _parse_execute_request(req_id, arguments: dict) -> 'dict | ExecuteContext':
         account_name = account.get('name', account_id)
     else:
         account_id = DEFAULT_ACCOUNT_ID
-        account = get_account(account_id) if account_id else None
+        account = get_account(account_id, prefetched) if account_id else None
         assume_role = account.get('role_arn') if account else None
         account_name = account.get('name', 'Default') if account else 'Default'
 
@@ -200,4 +214,5 @@ def _parse_execute_request(req_id, arguments: dict) -> 'dict | ExecuteContext':
         bot_id=arguments.get('_caller', {}).get('bot_id', 'unknown'),
         grant_id=arguments.get('grant_id', None),
         cli_input_json=arguments.get('cli_input_json') or None,
+        prefetched=prefetched,
     )
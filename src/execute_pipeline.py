@@ -12,7 +12,9 @@ from typing import Optional
 from botocore.exceptions import ClientError
 from aws_lambda_powertools import Logger
 
-from config_store import _is_silent_source
+from accounts import _get_accounts_table
+from agent_keys import prefetch_key as _agent_prefetch_key
+from config_store import _get_table as _get_config_table, _is_silent_source, is_cached as _config_is_cached
 from execute_context import ExecuteContext
 from execute_helpers import _safe_risk_category, _safe_risk_factors
 from utils import mcp_result, generate_request_id, log_decision, generate_display_summary, record_execution_error, extract_exit_code
@@ -21,9 +23,9 @@ from paging import store_paged_output
 from rate_limit import RateLimitExceeded, PendingLimitExceeded, check_rate_limit
 from trust import (
     increment_trust_command_count, should_trust_approve, track_command_executed,
-    TrustRateExceeded,
+    TrustRateExceeded, _compute_trust_id, _get_table as _get_trust_table,
 )
-from db import table
+from db import PrefetchSnapshot, batch_prefetch, table
 from notifications import (
     send_approval_request,
     send_trust_auto_approve_notification,
@@ -37,8 +39,10 @@ from constants import (
     RATE_LIMIT_WINDOW,
     TRUST_SESSION_MAX_COMMANDS,
     APPROVAL_TTL_BUFFER,
+    DEFAULT_ACCOUNT_ID,
     GRANT_SESSION_ENABLED,
     TELEGRAM_PAGE_SIZE,
+    TRUST_SESSION_ENABLED,
 )
 from compliance_checker import check_compliance  # noqa: E402
 from constants import PENDING_REMINDER_MINUTES  # noqa: E402
@@ -57,6 +61,48 @@ from template_scanner import scan_command_payloads  # noqa: E402
 logger = Logger(service="bouncer")
 
 
+def _prefetch_state(
+    account_id: Optional[str],
+    trust_scope: str,
+    grant_id: Optional[str] = None,
+    bouncer_key: Optional[str] = None,
+) -> PrefetchSnapshot:
+    """Phase 0: fetch every DynamoDB item the pipeline may read in one BatchGetItem.
+
+    Covers default/target account (accounts table), agent key and
+    silent_sources (config table), grant and trust sessions (requests table).
+    Items already held in a warm in-memory cache are skipped.  Never raises —
+    readers fall back to their own get_item for anything not in the snapshot.
+    """
+    account_id = str(account_id).strip() if account_id else ''
+    requests = []
+
+    accounts_tbl = _get_accounts_table()
+    for acct in {DEFAULT_ACCOUNT_ID, account_id}:
+        if acct:
+            requests.append((accounts_tbl, {'account_id': acct}))
+
+    config_tbl = _get_config_table()
+    agent_key = _agent_prefetch_key(bouncer_key) if isinstance(bouncer_key, str) else None
+    if agent_key:
+        requests.append((config_tbl, agent_key))
+    if not _config_is_cached('silent_sources'):
+        requests.append((config_tbl, {'config_key': 'silent_sources'}))
+
+    if GRANT_SESSION_ENABLED and grant_id and isinstance(grant_id, str):
+        requests.append((table, {'request_id': grant_id}))
+    if TRUST_SESSION_ENABLED and trust_scope:
+        trust_id = _compute_trust_id(trust_scope, account_id or DEFAULT_ACCOUNT_ID)
+        requests.append((_get_trust_table(), {'request_id': trust_id}))
+
+    snapshot = batch_prefetch(requests)
+    logger.debug(
+        "Prefetched %d/%d pipeline items", len(snapshot), len(requests),
+        extra={"src_module": "execute", "operation": "prefetch_state", "requested": len(requests), "fetched": len(snapshot)},
+    )
+    return snapshot
+
+
 def _score_risk(ctx: ExecuteContext) -> None:
     """Smart Approval Shadow Mode — score risk, log to DynamoDB.
 
@@ -249,7 +295,7 @@ def _check_grant_session(ctx: ExecuteContext) -> Optional[dict]:
             return None
 
 
-        grant = get_grant_session(grant_id)
+        grant = get_grant_session(grant_id, snapshot=ctx.prefetched)
 
         # Grant 不存在或非 active → fallthrough
         if not grant or grant.get('status') != 'active':
@@ -401,7 +447,7 @@ def _check_auto_approve(ctx: ExecuteContext) -> Optional[dict]:
 
     # Silent Telegram notification for safelist auto-approve (sprint24-003: throttled)
     # Silent notification mode (#380): skip notification for configured sources
-    notification_suppressed = _is_silent_source(ctx.source)
+    notification_suppressed = _is_silent_source(ctx.source, snapshot=ctx.prefetched)
 
     if not notification_suppressed and not _should_throttle_notification('auto_approve'):
         try:
@@ -550,7 +596,8 @@ def _check_rate_limit(ctx: ExecuteContext) -> Optional[dict]:
 def _check_trust_session(ctx: ExecuteContext) -> Optional[dict]:
     """Trust session auto-approve — execute if trusted."""
     should_trust, trust_session, trust_reason = should_trust_approve(
-        ctx.command, ctx.trust_scope, ctx.account_id, source=ctx.source or '', caller_ip=ctx.caller_ip
+        ctx.command, ctx.trust_scope, ctx.account_id, source=ctx.source or '', caller_ip=ctx.caller_ip,
+        snapshot=ctx.prefetched,
     )
     if not (should_trust and trust_session):
         return None
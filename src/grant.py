@@ -38,7 +38,7 @@ from aws_lambda_powertools import Logger
 from botocore.exceptions import ClientError
 
 import boto3
-from db import table
+from db import PrefetchSnapshot, read_item, table
 
 from constants import (
     DEFAULT_REGION,
@@ -51,8 +51,9 @@ from constants import (
 )
 from commands import is_blocked, is_dangerous  # noqa: E402
 from compliance_checker import check_compliance  # noqa: E402
-from risk_scorer import calculate_risk  # noqa: E402
+from risk_scorer import calculate_risk, calculate_risk_many  # noqa: E402
 from trust import is_trust_excluded  # noqa: E402
+from parsed_command import get_parsed_command  # noqa: E402
 
 logger = Logger(service="bouncer")
 
@@ -216,15 +217,17 @@ def normalize_command(command: str) -> str:
         正規化後的命令字串
     """
     try:
-        cmd = command.strip()
-        cmd = ' '.join(cmd.split())
-        cmd = cmd.lower()
-        return cmd
+        return get_parsed_command(command).match_key
     except (ValueError, TypeError, AttributeError) as e:
         logger.exception(f"[GRANT] normalize_command error: {e}", extra={"src_module": "grant", "operation": "normalize_command", "error": str(e)})
         return command.strip().lower() if command else ''
 
 
+def _normalize_for_match(command: str) -> str:
+    """normalize_command 的實作（由 ParsedCommandCache 呼叫）"""
+    return ' '.join(command.split()).lower()
+
+
 def create_grant_request(
     commands: list[str],
     reason: str,
@@ -304,9 +307,7 @@ def create_grant_request(
         commands_detail = []
         summary = {'total': len(commands), 'grantable': 0, 'requires_individual': 0, 'blocked': 0}
 
-        for cmd in commands:
-            normalized = normalize_command(cmd)
-            detail = _precheck_command(cmd, normalized, reason, source, account_id)
+        for detail in _precheck_commands(commands, reason, source, account_id):
             commands_detail.append(detail)
             summary[detail['category']] += 1
 
@@ -364,12 +365,61 @@ def create_grant_request(
         raise
 
 
+def _precheck_commands(
+    commands: list[str],
+    reason: str,
+    source: str,
+    account_id: str,
+) -> list[dict[str, Any]]:
+    """預檢整批命令
+
+    規則檢查（compliance / blocked / trust excluded）逐一進行，通過的命令
+    再以 calculate_risk_many 一次評分（共用規則、上下文與帳號分數）。
+
+    Returns:
+        與 commands 順序相同的 detail dict 列表（格式同 _precheck_command）
+    """
+    details = []
+    to_score = []
+    for cmd in commands:
+        detail = _precheck_command(cmd, normalize_command(cmd), reason, source, account_id, score_risk=False)
+        details.append(detail)
+        if detail['category'] == 'grantable':
+            to_score.append(detail)
+
+    if to_score:
+        try:
+            risks = calculate_risk_many(
+                [d['command'] for d in to_score],
+                reason=reason, source=source, account_id=account_id,
+            )
+            for detail, risk in zip(to_score, risks):
+                _apply_risk_score(detail, risk)
+        except Exception as e:  # noqa: BLE001 — fail-open risk scoring
+            logger.exception(f"[GRANT] risk scoring error: {e}", extra={"src_module": "grant", "operation": "risk_scoring", "error": str(e)})
+            # Fail-open for risk scoring: treat as grantable
+            for detail in to_score:
+                detail['risk_score'] = 0
+
+    return details
+
+
+def _apply_risk_score(detail: dict[str, Any], risk) -> None:
+    """依風險分數更新 detail（>= 66 需個別審批）"""
+    score = risk.score if hasattr(risk, 'score') else 0
+    detail['risk_score'] = score
+    if score >= 66:
+        detail['category'] = 'requires_individual'
+        detail['block_reason'] = f'風險分數 {score} >= 66'
+
+
 def _precheck_command(
     command: str,
     normalized: str,
     reason: str,
     source: str,
     account_id: str,
+    score_risk: bool = True,
 ) -> dict[str, Any]:
     """預檢單一命令，分類為 grantable / requires_individual / blocked
 
@@ -379,6 +429,7 @@ def _precheck_command(
         reason: 申請原因
         source: 請求來源
         account_id: AWS 帳號 ID
+        score_risk: 是否在此計算風險分數（批次預檢時由 _precheck_commands 統一計算）
 
     Returns:
         dict with command, normalized, category, risk_score, reason
@@ -415,13 +466,11 @@ def _precheck_command(
             return detail
 
         # 4. Risk score
+        if not score_risk:
+            return detail
         try:
             risk = calculate_risk(command, reason=reason, source=source, account_id=account_id)
-            score = risk.score if hasattr(risk, 'score') else 0
-            detail['risk_score'] = score
-            if score >= 66:
-                detail['category'] = 'requires_individual'
-                detail['block_reason'] = f'風險分數 {score} >= 66'
+            _apply_risk_score(detail, risk)
         except Exception as e:  # noqa: BLE001 — fail-open risk scoring
             logger.exception(f"[GRANT] risk scoring error: {e}", extra={"src_module": "grant", "operation": "risk_scoring", "error": str(e)})
             # Fail-open for risk scoring: treat as grantable
@@ -435,11 +484,12 @@ def _precheck_command(
     return detail
 
 
-def get_grant_session(grant_id: str) -> Optional[dict]:
+def get_grant_session(grant_id: str, snapshot: Optional[PrefetchSnapshot] = None) -> Optional[dict]:
     """查詢 Grant Session
 
     Args:
         grant_id: Grant ID
+        snapshot: execute pipeline 預取結果（可選）
 
     Returns:
         Grant session dict, or None
@@ -447,7 +497,7 @@ def get_grant_session(grant_id: str) -> Optional[dict]:
     try:
         if not grant_id:
             return None
-        result = table.get_item(Key={'request_id': grant_id})
+        result = read_item(table, {'request_id': grant_id}, snapshot)
         item = result.get('Item')
         if item and item.get('type') == 'grant_session':
             return item
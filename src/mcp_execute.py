@@ -13,7 +13,7 @@ from aws_lambda_powertools import Logger
 
 from execute_context import ExecuteContext, _parse_execute_request
 from execute_pipeline import (
-    _score_risk, _scan_template,
+    _prefetch_state, _score_risk, _scan_template,
     _check_compliance, _check_blocked, _check_grant_session, _check_auto_approve,
     _check_rate_limit, _check_trust_session, _submit_for_approval,
 )
@@ -24,6 +24,7 @@ from accounts import get_account, init_default_account, list_accounts, validate_
 from utils import mcp_result, mcp_error
 from constants import DEFAULT_ACCOUNT_ID, DEFAULT_REGION, MCP_MAX_WAIT
 from agent_keys import identify_agent, check_scope_authorization
+from parsed_command import emit_parse_cache_metrics
 
 logger = Logger(service="bouncer")
 
@@ -38,20 +39,29 @@ _check_chain_risks = check_chain_risks
 
 def mcp_tool_execute(req_id: str, arguments: dict) -> dict:
     """MCP tool: bouncer_execute（預設異步，立即返回 request_id）"""
+    bouncer_key = arguments.get('bouncer_key') or arguments.get('bouncer', {}).get('key')
+
+    # Phase 0: Prefetch account/agent/grant/trust/config items in one BatchGetItem
+    prefetched = _prefetch_state(
+        account_id=arguments.get('account'),
+        trust_scope=str(arguments.get('trust_scope', '')).strip(),
+        grant_id=arguments.get('grant_id'),
+        bouncer_key=bouncer_key,
+    )
+
     # Phase 1: Parse & validate request, resolve account
-    ctx = _parse_execute_request(req_id, arguments)
+    ctx = _parse_execute_request(req_id, arguments, prefetched=prefetched)
     if not isinstance(ctx, ExecuteContext):
         return ctx  # validation error — already an MCP response dict
 
     # Phase 1.5: Agent identity check (#418) — server-side source override
-    bouncer_key = arguments.get('bouncer_key') or arguments.get('bouncer', {}).get('key')
     # Redact key from arguments immediately to prevent accidental logging
     arguments.pop('bouncer_key', None)
     if isinstance(arguments.get('bouncer'), dict):
         arguments['bouncer'].pop('key', None)
     agent = None
     if bouncer_key:
-        agent = identify_agent(bouncer_key, caller_ip=ctx.caller_ip)
+        agent = identify_agent(bouncer_key, caller_ip=ctx.caller_ip, snapshot=ctx.prefetched)
         if agent:
             # Server-side source override — cannot be spoofed
             ctx.source = agent['agent_name']
@@ -80,6 +90,7 @@ def mcp_tool_execute(req_id: str, arguments: dict) -> dict:
 
     # Phase 2.5: Template scan — escalate to MANUAL on HIGH/CRITICAL hits
     _scan_template(ctx)
+    emit_parse_cache_metrics()
 
     # Phase 2.5.5: Agent scope risk check — now that risk_score is available, check max_risk_score
     if agent and ctx.smart_decision:
@@ -318,8 +329,15 @@ def mcp_tool_execute_native(req_id: str, arguments: dict) -> dict:
     # This allows existing compliance rules to work with native calls
     synthetic_command = f"aws {cli_service} {operation_kebab} {json.dumps(params, separators=(',', ':'))}"
 
+    # Phase 0: Prefetch account/agent/trust/config items in one BatchGetItem
+    prefetched = _prefetch_state(
+        account_id=account_id,
+        trust_scope=trust_scope,
+        bouncer_key=arguments.get('bouncer_key') or bouncer_section.get('key'),
+    )
+
     # 初始化預設帳號
-    init_default_account()
+    init_default_account(prefetched)
 
     # 解析帳號配置
     if account_id:
@@ -334,7 +352,7 @@ def mcp_tool_execute_native(req_id: str, arguments: dict) -> dict:
                 'isError': True
             })
 
-        account = get_account(account_id)
+        account = get_account(account_id, prefetched)
         if not account:
             available = [a['account_id'] for a in list_accounts()]
             error_data = {
@@ -369,7 +387,7 @@ def mcp_tool_execute_native(req_id: str, arguments: dict) -> dict:
         account_name = account.get('name', account_id)
     else:
         account_id = DEFAULT_ACCOUNT_ID
-        account = get_account(account_id) if account_id else None
+        account = get_account(account_id, prefetched) if account_id else None
         assume_role = account.get('role_arn') if account else None
         account_name = account.get('name', 'Default') if account else 'Default'
 
@@ -401,6 +419,7 @@ def mcp_tool_execute_native(req_id: str, arguments: dict) -> dict:
         native_region=region,
         # Warnings
         warnings=warnings if warnings else None,
+        prefetched=prefetched,
     )
 
     # Phase 1.5: Agent identity check (#418) — server-side source override
@@ -411,7 +430,7 @@ def mcp_tool_execute_native(req_id: str, arguments: dict) -> dict:
         bouncer_section.pop('key', None)
     agent = None
     if bouncer_key:
-        agent = identify_agent(bouncer_key, caller_ip=ctx.caller_ip)
+        agent = identify_agent(bouncer_key, caller_ip=ctx.caller_ip, snapshot=ctx.prefetched)
         if agent:
             # Server-side source override — cannot be spoofed
             ctx.source = agent['agent_name']
@@ -440,6 +459,7 @@ def mcp_tool_execute_native(req_id: str, arguments: dict) -> dict:
 
     # Phase 2.5: Template scan — escalate to MANUAL on HIGH/CRITICAL hits
     _scan_template(ctx)
+    emit_parse_cache_metrics()
 
     # Phase 2.5.5: Agent scope risk check — now that risk_score is available, check max_risk_score
     if agent and ctx.smart_decision:
@@ -0,0 +1,223 @@
+"""
+Bouncer - Parsed Command Cache
+命令解析結果共用快取：同一命令字串只解析一次
+
+同一個請求中，命令會被多個層級各自解析：
+- execute_context._normalize_command（SEC-003 Unicode 正規化）
+- commands.aws_cli_split（argv tokens）
+- risk_scorer.parse_command（service / action / params）
+- sequence_analyzer.parse_action_from_command / extract_resource_ids
+- grant.normalize_command（grant 比對用）
+- template_scanner.extract_json_payloads（inline JSON payload）
+
+ParsedCommandCache 以原始命令字串為 key，產生單一不可變的 CommandParse；
+各欄位在第一次存取時才計算（lazy），之後所有層級共用同一份結果。
+快取為 warm container 內的 bounded LRU，並提供命中率統計。
+
+各欄位的解析邏輯仍保留在原模組（避免行為漂移），本模組只負責快取與共用。
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Optional
+
+from aws_lambda_powertools import Logger
+from metrics import emit_metric
+from constants import PARSE_CACHE_MAX_ENTRIES, PARSE_CACHE_MAX_COMMAND_LENGTH
+
+logger = Logger(service="bouncer")
+
+__all__ = [
+    'CommandParse',
+    'ParsedCommandCache',
+    'get_parsed_command',
+    'get_parse_cache',
+    'emit_parse_cache_metrics',
+]
+
+
+# ============================================================================
+# Parsed Representation
+# ============================================================================
+
+@dataclass(frozen=True, eq=False)
+class CommandParse:
+    """
+    單一命令的解析結果（不可變，欄位 lazy 計算後快取於實例上）
+
+    Attributes:
+        raw: 原始命令字串（快取 key）
+
+    回傳的 tuple / MappingProxyType 皆為唯讀；JSON payload 內的 dict/list
+    在多個呼叫者之間共用，呼叫者須視為唯讀（template_scanner 的 check 皆為純函數）。
+    """
+    raw: str
+
+    @cached_property
+    def normalized(self) -> str:
+        """SEC-003 Unicode 正規化後的命令"""
+        from execute_context import _normalize_unicode
+        return _normalize_unicode(self.raw)
+
+    @cached_property
+    def match_key(self) -> str:
+        """Grant 比對用的正規化命令（空白壓縮 + 小寫）"""
+        from grant import _normalize_for_match
+        return _normalize_for_match(self.raw)
+
+    @cached_property
+    def tokens(self) -> tuple[str, ...]:
+        """aws_cli_split 產生的 argv tokens"""
+        from commands import _split_aws_cli
+        return tuple(_split_aws_cli(self.raw))
+
+    @cached_property
+    def service_action(self) -> tuple[str, str]:
+        """(service, action)，service 已套用別名"""
+        from sequence_analyzer import _parse_service_action
+        return _parse_service_action(self.raw)
+
+    @property
+    def service(self) -> str:
+        return self.service_action[0]
+
+    @property
+    def action(self) -> str:
+        return self.service_action[1]
+
+    @cached_property
+    def risk_parse(self):
+        """risk_scorer.ParsedCommand（共用實例，請勿修改；parse_command 會回傳副本）"""
+        from risk_scorer import _parse_aws_command
+        return _parse_aws_command(self.raw)
+
+    @property
+    def params(self) -> MappingProxyType:
+        """參數字典 {參數名: 值}（唯讀）"""
+        return MappingProxyType(self.risk_parse.parameters)
+
+    @cached_property
+    def resource_ids(self) -> tuple[str, ...]:
+        """命令中的資源 ID"""
+        from sequence_analyzer import _scan_resource_ids
+        return tuple(_scan_resource_ids(self.raw))
+
+    @property
+    def json_payloads(self) -> tuple[tuple[tuple[str, Any], ...], bool]:
+        """(payloads, extraction_failed)
+
+        抽取失敗時不快取（fail-closed，s61-001）：下一次存取會重新抽取。
+        """
+        cached = self.__dict__.get('_json_payloads')
+        if cached is not None:
+            return cached
+        from template_scanner import _extract_all_payloads
+        results, extraction_failed = _extract_all_payloads(self.raw)
+        value = (tuple(results), extraction_failed)
+        if not extraction_failed:
+            self.__dict__['_json_payloads'] = value
+        return value
+
+
+# ============================================================================
+# LRU Cache
+# ============================================================================
+
+class ParsedCommandCache:
+    """
+    Bounded LRU：raw command → CommandParse
+
+    Thread-safe。超過 max_command_length 的命令仍會回傳 CommandParse，
+    但不放入快取（計為 bypass）。
+    """
+
+    def __init__(self, max_entries: int = PARSE_CACHE_MAX_ENTRIES,
+                 max_command_length: int = PARSE_CACHE_MAX_COMMAND_LENGTH):
+        self.max_entries = max_entries
+        self.max_command_length = max_command_length
+        self._entries: OrderedDict[str, CommandParse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def get(self, command: str) -> CommandParse:
+        """取得命令的 CommandParse（不存在則建立）"""
+        if len(command) > self.max_command_length or self.max_entries <= 0:
+            with self._lock:
+                self.bypasses += 1
+            return CommandParse(command)
+
+        with self._lock:
+            entry = self._entries.get(command)
+            if entry is not None:
+                self._entries.move_to_end(command)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            entry = self._entries[command] = CommandParse(command)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def clear(self) -> None:
+        """清空快取與統計"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.bypasses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率（0.0 - 1.0），尚無查詢時為 0.0"""
+        total = self.hits + self.misses + self.bypasses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """快取統計（warm container 生命週期內累計）"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bypasses': self.bypasses,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': round(self.hit_rate, 4),
+            }
+
+
+_cache: Optional[ParsedCommandCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParsedCommandCache:
+    """取得 container 全域的 ParsedCommandCache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ParsedCommandCache()
+    return _cache
+
+
+def get_parsed_command(command: str) -> CommandParse:
+    """取得命令的共用解析結果"""
+    return get_parse_cache().get(command)
+
+
+def emit_parse_cache_metrics() -> None:
+    """送出快取命中率 metric（每個請求結束時呼叫一次）。不會拋出例外。"""
+    try:
+        stats = get_parse_cache().stats()
+        emit_metric('Bouncer', 'ParsedCommandCacheHitRate', stats['hit_rate'] * 100, unit='Percent')
+        emit_metric('Bouncer', 'ParsedCommandCacheSize', stats['size'])
+    except Exception as e:  # noqa: BLE001 — metrics must never break the request
+        logger.warning("Parse cache metric error: %s", e, extra={"src_module": "parsed_command", "operation": "emit_parse_cache_metrics", "error": str(e)})
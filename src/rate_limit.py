@@ -1,14 +1,23 @@
 """
 Bouncer - Rate Limiting 模組
 處理請求頻率限制和 pending 請求上限
+
+兩種 backend（constants.RATE_LIMIT_MODE）：
+- counter: 每 source 每個固定視窗一個計數 item（request_id = ratelimit#{source}#{window}），
+  以單次 conditional UpdateItem 原子遞增；pending 查詢限定在 RATE_LIMIT_PENDING_LOOKBACK 內
+- query:   舊版 source-created-index COUNT 查詢
 """
 import time
 
+from botocore.exceptions import ClientError
+
 import db as _db
 
 from constants import (
     RATE_LIMIT_ENABLED, RATE_LIMIT_WINDOW, RATE_LIMIT_MAX_REQUESTS,
     MAX_PENDING_PER_SOURCE,
+    RATE_LIMIT_MODE, RATE_LIMIT_MODE_COUNTER,
+    RATE_LIMIT_PENDING_LOOKBACK, RATE_LIMIT_COUNTER_PREFIX,
 )
 
 __all__ = [
@@ -47,7 +56,7 @@ def check_rate_limit(source: str) -> None:
         source: 請求來源識別
 
     Raises:
-        RateLimitExceeded: 如果超出頻率限制
+        RateLimitExceeded: 如果超出頻率限制（或檢查失敗 — fail-closed）
         PendingLimitExceeded: 如果 pending 請求過多
     """
     if not RATE_LIMIT_ENABLED:
@@ -57,53 +66,16 @@ def check_rate_limit(source: str) -> None:
         source = "__anonymous__"
 
     now = int(time.time())
-    window_start = now - RATE_LIMIT_WINDOW
 
     try:
-        # 查詢此 source 在時間視窗內的審批請求數
-        response = _get_table().query(
-            IndexName='source-created-index',
-            KeyConditionExpression='#src = :source AND created_at >= :window_start',
-            FilterExpression='#st IN (:pending, :approved, :denied)',
-            ExpressionAttributeNames={
-                '#src': 'source',
-                '#st': 'status'
-            },
-            ExpressionAttributeValues={
-                ':source': source,
-                ':window_start': window_start,
-                ':pending': 'pending_approval',
-                ':approved': 'approved',
-                ':denied': 'denied'
-            },
-            Select='COUNT'
-        )
-
-        recent_count = response.get('Count', 0)
-
-        if recent_count >= RATE_LIMIT_MAX_REQUESTS:
-            raise RateLimitExceeded(
-                f"Rate limit exceeded: {recent_count}/{RATE_LIMIT_MAX_REQUESTS} "
-                f"requests in last {RATE_LIMIT_WINDOW}s"
-            )
-
-        # 查詢 pending 請求數
-        pending_response = _get_table().query(
-            IndexName='source-created-index',
-            KeyConditionExpression='#src = :source',
-            FilterExpression='#st = :pending',
-            ExpressionAttributeNames={
-                '#src': 'source',
-                '#st': 'status'
-            },
-            ExpressionAttributeValues={
-                ':source': source,
-                ':pending': 'pending_approval'
-            },
-            Select='COUNT'
-        )
+        if RATE_LIMIT_MODE == RATE_LIMIT_MODE_COUNTER:
+            _consume_window_slot(source, now)
+            pending_since = now - RATE_LIMIT_PENDING_LOOKBACK
+        else:
+            _check_window_by_query(source, now)
+            pending_since = None
 
-        pending_count = pending_response.get('Count', 0)
+        pending_count = _count_pending(source, pending_since)
 
         if pending_count >= MAX_PENDING_PER_SOURCE:
             raise PendingLimitExceeded(
@@ -116,3 +88,82 @@ def check_rate_limit(source: str) -> None:
     except Exception as e:  # noqa: BLE001 — fail-closed rate limit check
         # SEC-006: fail-close — DynamoDB 故障時拒絕而非放行
         raise RateLimitExceeded(f"Rate limit check failed: {e}") from e
+
+
+def _consume_window_slot(source: str, now: int) -> None:
+    """counter 模式：原子遞增本視窗計數，已達上限時 ConditionalCheckFailed → RateLimitExceeded"""
+    window_index = now // RATE_LIMIT_WINDOW
+    window_end = (window_index + 1) * RATE_LIMIT_WINDOW
+    try:
+        _get_table().update_item(
+            Key={'request_id': f"{RATE_LIMIT_COUNTER_PREFIX}{source}#{window_index}"},
+            UpdateExpression='ADD hits :one SET #ttl = :ttl',
+            ConditionExpression='attribute_not_exists(hits) OR hits < :max',
+            ExpressionAttributeNames={'#ttl': 'ttl'},
+            ExpressionAttributeValues={
+                ':one': 1,
+                ':max': RATE_LIMIT_MAX_REQUESTS,
+                ':ttl': window_end + RATE_LIMIT_WINDOW,
+            },
+        )
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            raise RateLimitExceeded(
+                f"Rate limit exceeded: {RATE_LIMIT_MAX_REQUESTS}/{RATE_LIMIT_MAX_REQUESTS} "
+                f"requests in last {RATE_LIMIT_WINDOW}s"
+            ) from e
+        raise
+
+
+def _check_window_by_query(source: str, now: int) -> None:
+    """query 模式：COUNT 此 source 在時間視窗內的審批請求數"""
+    response = _get_table().query(
+        IndexName='source-created-index',
+        KeyConditionExpression='#src = :source AND created_at >= :window_start',
+        FilterExpression='#st IN (:pending, :approved, :denied)',
+        ExpressionAttributeNames={
+            '#src': 'source',
+            '#st': 'status'
+        },
+        ExpressionAttributeValues={
+            ':source': source,
+            ':window_start': now - RATE_LIMIT_WINDOW,
+            ':pending': 'pending_approval',
+            ':approved': 'approved',
+            ':denied': 'denied'
+        },
+        Select='COUNT'
+    )
+
+    recent_count = response.get('Count', 0)
+
+    if recent_count >= RATE_LIMIT_MAX_REQUESTS:
+        raise RateLimitExceeded(
+            f"Rate limit exceeded: {recent_count}/{RATE_LIMIT_MAX_REQUESTS} "
+            f"requests in last {RATE_LIMIT_WINDOW}s"
+        )
+
+
+def _count_pending(source: str, since: 'int | None') -> int:
+    """COUNT 此 source 的 pending 請求（since=None 時不限時間）"""
+    key_condition = '#src = :source'
+    values = {
+        ':source': source,
+        ':pending': 'pending_approval'
+    }
+    if since is not None:
+        key_condition += ' AND created_at >= :since'
+        values[':since'] = since
+
+    pending_response = _get_table().query(
+        IndexName='source-created-index',
+        KeyConditionExpression=key_condition,
+        FilterExpression='#st = :pending',
+        ExpressionAttributeNames={
+            '#src': 'source',
+            '#st': 'status'
+        },
+        ExpressionAttributeValues=values,
+        Select='COUNT'
+    )
+    return pending_response.get('Count', 0)
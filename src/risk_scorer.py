@@ -25,14 +25,16 @@ Version: 1.0.0
 import json
 import re
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
 
 from aws_lambda_powertools import Logger
+from metrics import emit_metric
 from utils import RiskFactor  # canonical definition in utils.py
 from template_scanner import scan_command_payloads  # noqa: E402
+from parsed_command import get_parsed_command  # noqa: E402
 
 logger = Logger(service="bouncer")
 
@@ -43,8 +45,10 @@ __all__ = [
     'RiskResult',
     'ParsedCommand',
     'RiskRules',
+    'RiskRuleBank',
     # Core functions
     'calculate_risk',
+    'calculate_risk_many',
     'load_risk_rules',
     'parse_command',
     # Scoring functions
@@ -55,8 +59,12 @@ __all__ = [
     # Utilities
     'get_category_from_score',
     'create_default_rules',
+    'EVALUATION_BUDGET_MS',
 ]
 
+# 決策延遲目標（見模組說明「決策延遲 <50ms」）；超過時送出 RiskEvaluationOverBudget metric
+EVALUATION_BUDGET_MS = 50.0
+
 
 # ============================================================================
 # Enums and Data Classes
@@ -191,6 +199,22 @@ class RiskRules:
         'context': 0.20,
         'account': 0.10,
     })
+    _rule_bank: Optional['RiskRuleBank'] = field(default=None, init=False, repr=False, compare=False)
+
+    def get_rule_bank(self) -> 'RiskRuleBank':
+        """
+        取得預編譯的 pattern bank
+
+        載入時編譯一次並掛在此 RiskRules 上；若 blocked_patterns /
+        parameter_patterns 之後被修改，會自動重新編譯。
+
+        Raises:
+            re.error: pattern 無法編譯（呼叫端 fail-closed）
+        """
+        key = RiskRuleBank.key_for(self)
+        if self._rule_bank is None or self._rule_bank.key != key:
+            self._rule_bank = RiskRuleBank(self.blocked_patterns, self.parameter_patterns)
+        return self._rule_bank
 
     def validate(self) -> tuple[bool, list[str]]:
         """
@@ -215,9 +239,66 @@ class RiskRules:
             if not 0 <= score <= 100:
                 errors.append(f"服務 '{service}' 分數 {score} 超出範圍 [0, 100]")
 
+        # 檢查 pattern 是否可編譯
+        for pattern in self.blocked_patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                errors.append(f"黑名單 pattern '{pattern}' 無效: {e}")
+        for rule in self.parameter_patterns:
+            try:
+                re.compile(rule.get('pattern', ''), re.IGNORECASE)
+            except re.error as e:
+                errors.append(f"參數 pattern '{rule.get('pattern', '')}' 無效: {e}")
+
         return len(errors) == 0, errors
 
 
+class RiskRuleBank:
+    """
+    預編譯的規則 pattern bank
+
+    每條 blocked / parameter pattern 在載入時編譯一次，評分時不再依賴
+    ``re`` 模組的快取（規則數量超過快取上限時會反覆重新編譯）。
+    一次呼叫即回報所有命中的規則，順序與規則列表相同。
+
+    Note:
+        曾測試過把所有 pattern 合併成一個具名群組 alternation，但 CPython
+        的回溯引擎要在每個位置逐一嘗試所有分支，數百條規則時比逐條預編譯
+        搜尋慢兩個數量級，因此採用逐條預編譯。
+    """
+
+    def __init__(self, blocked_patterns: list[str], parameter_patterns: list[dict]):
+        self.key = self._make_key(blocked_patterns, parameter_patterns)
+        self._blocked = [(p, re.compile(p)) for p in blocked_patterns]
+        self._parameters = [
+            (rule, re.compile(rule.get('pattern', ''), re.IGNORECASE))
+            for rule in parameter_patterns
+        ]
+
+    @staticmethod
+    def _make_key(blocked_patterns: list[str], parameter_patterns: list[dict]) -> tuple:
+        return (
+            tuple(blocked_patterns),
+            tuple(rule.get('pattern', '') for rule in parameter_patterns),
+        )
+
+    @classmethod
+    def key_for(cls, rules: RiskRules) -> tuple:
+        return cls._make_key(rules.blocked_patterns, rules.parameter_patterns)
+
+    def first_blocked(self, cmd_lower: str) -> Optional[str]:
+        """回傳第一個命中的黑名單 pattern（依規則順序），沒有則 None"""
+        for pattern, regex in self._blocked:
+            if regex.search(cmd_lower):
+                return pattern
+        return None
+
+    def matching_parameters(self, cmd_str: str) -> list[dict]:
+        """回傳所有命中的參數規則（依規則順序）"""
+        return [rule for rule, regex in self._parameters if regex.search(cmd_str)]
+
+
 # ============================================================================
 # Default Rules (Inline Fallback)
 # ============================================================================
@@ -306,6 +387,9 @@ def load_risk_rules(
         if not is_valid:
             logger.warning("Rule validation errors: %s", errors, extra={"src_module": "risk_scorer", "operation": "validate_rules", "error_count": len(errors)})
             # 仍然使用載入的規則，但記錄警告
+        else:
+            # 載入時預先編譯 pattern bank（無效 pattern 留到評分時 fail-closed）
+            rules.get_rule_bank()
 
         # 更新快取
         _rules_cache = rules
@@ -379,20 +463,38 @@ def _dict_to_rules(data: dict) -> RiskRules:
 # Command Parsing
 # ============================================================================
 
+_QUERY_QUOTED_RE = re.compile(r"--query\s+['\"].*?['\"]")
+
+
 def parse_command(command: str) -> ParsedCommand:
     """
-    解析 AWS CLI 命令
+    解析 AWS CLI 命令（經 ParsedCommandCache 共用解析結果）
 
     Args:
         command: AWS CLI 命令字串
                  例如: "aws ec2 describe-instances --instance-ids i-1234567890abcdef0"
 
     Returns:
-        ParsedCommand 物件，包含解析後的結構化資訊
+        ParsedCommand 物件（副本，呼叫者可自由修改）
 
     Note:
         此函數不會拋出異常，解析失敗會在 ParsedCommand.is_valid 標記為 False
     """
+    if not isinstance(command, str):
+        return _parse_aws_command(command)
+    shared = get_parsed_command(command).risk_parse
+    return replace(
+        shared,
+        parameters=dict(shared.parameters),
+        flags=list(shared.flags),
+        targets=list(shared.targets),
+    )
+
+
+def _parse_aws_command(command: str) -> ParsedCommand:
+    """
+    parse_command 的實作（由 ParsedCommandCache 呼叫，不經快取）
+    """
     try:
         original = command.strip()
 
@@ -410,11 +512,7 @@ def parse_command(command: str) -> ParsedCommand:
             cmd = cmd[4:]
 
         # 處理 --query 參數中可能包含的特殊字元
-        cmd_for_parsing = re.sub(
-            r"--query\s+['\"].*?['\"]",
-            "--query REDACTED",
-            cmd
-        )
+        cmd_for_parsing = _QUERY_QUOTED_RE.sub("--query REDACTED", cmd)
 
         # 分割命令
         parts = cmd_for_parsing.split()
@@ -537,17 +635,17 @@ def score_verb(
 
     # 1. 檢查黑名單（立即回傳 100）
     cmd_lower = parsed.original.lower()
-    for pattern in rules.blocked_patterns:
-        if re.search(pattern, cmd_lower):
-            factors.append(RiskFactor(
-                name=f"Blocked pattern: {pattern}",
-                category="verb",
-                raw_score=100,
-                weighted_score=100 * rules.weights['verb'],
-                weight=rules.weights['verb'],
-                details="Command matches blocked pattern - immediate rejection",
-            ))
-            return 100, factors
+    pattern = rules.get_rule_bank().first_blocked(cmd_lower)
+    if pattern is not None:
+        factors.append(RiskFactor(
+            name=f"Blocked pattern: {pattern}",
+            category="verb",
+            raw_score=100,
+            weighted_score=100 * rules.weights['verb'],
+            weight=rules.weights['verb'],
+            details="Command matches blocked pattern - immediate rejection",
+        ))
+        return 100, factors
 
     # 2. 動詞分數
     verb_score = rules.verb_scores.get(parsed.verb, 50)  # 未知動詞預設 50
@@ -600,21 +698,20 @@ def score_parameters(
     cmd_str = parsed.original.lower()
 
     # 1. 檢查參數模式
-    for pattern_rule in rules.parameter_patterns:
+    for pattern_rule in rules.get_rule_bank().matching_parameters(cmd_str):
         pattern = pattern_rule.get('pattern', '')
         score = pattern_rule.get('score', 0)
         description = pattern_rule.get('description', pattern)
 
-        if re.search(pattern, cmd_str, re.IGNORECASE):
-            factors.append(RiskFactor(
-                name=f"Parameter pattern: {description}",
-                category="parameter",
-                raw_score=score,
-                weighted_score=0,
-                weight=0,
-                details=f"Matched pattern: {pattern}",
-            ))
-            max_pattern_score = max(max_pattern_score, score)
+        factors.append(RiskFactor(
+            name=f"Parameter pattern: {description}",
+            category="parameter",
+            raw_score=score,
+            weighted_score=0,
+            weight=0,
+            details=f"Matched pattern: {pattern}",
+        ))
+        max_pattern_score = max(max_pattern_score, score)
 
     # 2. 檢查危險旗標
     for flag in parsed.flags:
@@ -895,6 +992,94 @@ def calculate_risk(
         >>> print(result.score)
         15
     """
+    result = _calculate_risk(command, reason, source, account_id, rules)
+    _record_evaluation_time(result)
+    return result
+
+
+def _record_evaluation_time(result: RiskResult) -> None:
+    """送出評估耗時 metric；超過 EVALUATION_BUDGET_MS 時額外記錄 over-budget"""
+    emit_metric('Bouncer', 'RiskEvaluationTime', result.evaluation_time_ms, unit='Milliseconds')
+    if result.evaluation_time_ms > EVALUATION_BUDGET_MS:
+        emit_metric('Bouncer', 'RiskEvaluationOverBudget', 1)
+        logger.warning(
+            "Risk evaluation over budget: %.1fms > %.0fms",
+            result.evaluation_time_ms, EVALUATION_BUDGET_MS,
+            extra={"src_module": "risk_scorer", "operation": "calculate_risk",
+                   "evaluation_time_ms": result.evaluation_time_ms, "rule_version": result.rule_version},
+        )
+
+
+def calculate_risk_many(
+    commands: list[str],
+    reason: str = "",
+    source: str = "",
+    account_id: str = "",
+    rules: Optional[RiskRules] = None,
+) -> list[RiskResult]:
+    """
+    批次計算多個命令的風險分數
+
+    與逐一呼叫 calculate_risk 結果相同，但整批共用：
+    - 規則與預編譯 pattern bank（只載入一次）
+    - 上下文 / 帳號敏感度分數（只和 reason/source/account 有關，只算一次）
+    - 解析結果（經 ParsedCommandCache，重複的命令只解析一次）
+
+    Args:
+        commands: AWS CLI 命令列表
+        reason: 執行原因
+        source: 請求來源
+        account_id: 目標 AWS 帳號 ID
+        rules: 可選的風險規則
+
+    Returns:
+        與 commands 順序相同的 RiskResult 列表
+
+    Note:
+        Fail-closed 以單一命令為單位：某個命令評估失敗只影響該命令（分數 70）
+    """
+    if rules is None:
+        rules = load_risk_rules()
+
+    shared = None
+    try:
+        shared = _score_shared_context(reason, source, account_id, rules)
+    except Exception as e:  # noqa: BLE001
+        # 共用分數失敗 → 逐一計算，讓每個命令各自 fail-closed
+        logger.exception("Shared context scoring failed: %s", e, extra={"src_module": "risk_scorer", "operation": "calculate_risk_many", "error": str(e)})
+
+    results = []
+    for command in commands:
+        result = _calculate_risk(command, reason, source, account_id, rules, shared=shared)
+        _record_evaluation_time(result)
+        results.append(result)
+    return results
+
+
+def _score_shared_context(
+    reason: str,
+    source: str,
+    account_id: str,
+    rules: RiskRules,
+) -> tuple[int, list[RiskFactor], int, list[RiskFactor]]:
+    """計算只和上下文/帳號有關的分數（批次共用）"""
+    context_score, context_factors = score_context(reason, source, rules)
+    account_score, account_factors = score_account(account_id, rules)
+    return context_score, context_factors, account_score, account_factors
+
+
+def _calculate_risk(
+    command: str,
+    reason: str,
+    source: str,
+    account_id: str,
+    rules: Optional[RiskRules],
+    shared: Optional[tuple] = None,
+) -> RiskResult:
+    """calculate_risk 的實作（不含耗時 metric）
+
+    shared 由 calculate_risk_many 傳入，用於批次共用計算結果。
+    """
     start_time = time.perf_counter()
 
     try:
@@ -949,13 +1134,13 @@ def calculate_risk(
         param_score, param_factors = score_parameters(parsed, rules)
         all_factors.extend(param_factors)
 
-        # 3. 上下文分數 (20%)
-        context_score, context_factors = score_context(reason, source, rules)
-        all_factors.extend(context_factors)
-
-        # 4. 帳號敏感度分數 (10%)
-        account_score, account_factors = score_account(account_id, rules)
-        all_factors.extend(account_factors)
+        # 3. 上下文分數 (20%) / 4. 帳號敏感度分數 (10%)
+        if shared is None:
+            shared = _score_shared_context(reason, source, account_id, rules)
+        context_score, context_factors, account_score, account_factors = shared
+        # 每個結果持有自己的 factor 物件（下方會寫入 weighted_score）
+        all_factors.extend(replace(f) for f in context_factors)
+        all_factors.extend(replace(f) for f in account_factors)
 
         # 計算加權總分
         weights = rules.weights
@@ -28,6 +28,7 @@ import db as _db
 from boto3.dynamodb.conditions import Key
 from metrics import emit_metric
 from constants import COMMAND_HISTORY_TABLE_NAME
+from parsed_command import get_parsed_command
 
 logger = Logger(service="bouncer")
 
@@ -463,7 +464,7 @@ RESOURCE_ID_PATTERNS: list[dict[str, Any]] = [
 
 def extract_resource_ids(command: str) -> list[str]:
     """
-    從命令中提取資源 ID
+    從命令中提取資源 ID（經 ParsedCommandCache 共用）
 
     Args:
         command: AWS CLI 命令
@@ -471,6 +472,11 @@ def extract_resource_ids(command: str) -> list[str]:
     Returns:
         提取到的資源 ID 列表
     """
+    return list(get_parsed_command(command).resource_ids)
+
+
+def _scan_resource_ids(command: str) -> list[str]:
+    """extract_resource_ids 的實作（由 ParsedCommandCache 呼叫）"""
     resource_ids = []
 
     for pattern_def in RESOURCE_ID_PATTERNS:
@@ -493,7 +499,7 @@ def extract_resource_ids(command: str) -> list[str]:
 
 def parse_action_from_command(command: str) -> tuple[str, str]:
     """
-    從命令解析服務和動作
+    從命令解析服務和動作（經 ParsedCommandCache 共用）
 
     Args:
         command: AWS CLI 命令
@@ -501,6 +507,11 @@ def parse_action_from_command(command: str) -> tuple[str, str]:
     Returns:
         (service, action) 元組
     """
+    return get_parsed_command(command).service_action
+
+
+def _parse_service_action(command: str) -> tuple[str, str]:
+    """parse_action_from_command 的實作（由 ParsedCommandCache 呼叫）"""
     # 移除 aws 前綴
     cmd = command.strip()
     if cmd.startswith('aws '):
@@ -7,7 +7,7 @@ Bouncer - Smart Approval Module
 
 from aws_lambda_powertools import Logger
 
-from risk_scorer import calculate_risk, RiskCategory, RiskResult
+from risk_scorer import calculate_risk, calculate_risk_many, RiskCategory, RiskResult
 from utils import RiskFactor
 from sequence_analyzer import get_sequence_risk_modifier
 from metrics import emit_metric
@@ -16,6 +16,7 @@ logger = Logger(service="bouncer")
 
 __all__ = [
     'evaluate_command',
+    'evaluate_commands',
     'ApprovalDecision',
 ]
 
@@ -83,75 +84,120 @@ def evaluate_command(
     try:
         # Step 1: 計算基礎風險分數
         risk_result = calculate_risk(command, reason, source, account_id)
-        base_score = risk_result.score
-
-        # Step 2: 序列分析修正（可選）
-        sequence_modifier = 0.0
-        if enable_sequence_analysis:
-            try:
-                sequence_modifier, _seq_reason = get_sequence_risk_modifier(source, command)
-            except Exception as e:  # noqa: BLE001
-                logger.warning("Sequence analysis failed: %s", e, extra={"src_module": "smart_approval", "operation": "evaluate_command", "error": str(e)})
-                # 序列分析失敗不影響主流程
-
-        # Step 3: 計算最終分數（加入序列修正）
-        # sequence_modifier 是 -0.3 到 +0.3 的修正值
-        final_score = int(base_score * (1 + sequence_modifier))
-        final_score = max(0, min(100, final_score))  # 確保在 0-100
-
-        # Step 4: 根據分數決定審批流程
-        if risk_result.category == RiskCategory.BLOCK or final_score >= 86:
-            decision = ApprovalDecision.BLOCKED
-            reason_text = f"風險分數 {final_score} >= 86，自動拒絕"
-        elif final_score <= 25:
-            decision = ApprovalDecision.AUTO_APPROVE
-            reason_text = f"風險分數 {final_score} <= 25，自動批准"
-        elif final_score <= 45:
-            decision = ApprovalDecision.NEEDS_CONFIRMATION
-            reason_text = f"風險分數 {final_score}，需要確認（中等風險）"
-        elif final_score <= 65:
-            decision = ApprovalDecision.NEEDS_CONFIRMATION
-            reason_text = f"風險分數 {final_score}，需要確認 reason"
-        else:
-            decision = ApprovalDecision.NEEDS_APPROVAL
-            reason_text = f"風險分數 {final_score}，需要人工審批"
-
-        # Emit metrics for monitoring
-        emit_metric('Bouncer', 'SmartApprovalDecision', 1,
-                    dimensions=[{'Name': 'Decision', 'Value': decision}])
-        emit_metric('Bouncer', 'SmartApprovalScore', final_score)
-
-        return ApprovalDecision(
-            decision=decision,
-            risk_result=risk_result,
-            sequence_modifier=sequence_modifier,
-            final_score=final_score,
-            reason=reason_text,
-        )
+        return _decide(command, source, risk_result, enable_sequence_analysis)
 
     except Exception as e:  # noqa: BLE001
         # Fail-closed: 任何錯誤都 fallback 到人工審批
-        logger.exception("Risk evaluation failed: %s", e, extra={"src_module": "smart_approval", "operation": "evaluate_command", "error": str(e)})
-        emit_metric('Bouncer', 'SmartApprovalError', 1)
-        fallback_result = RiskResult(
-            score=70,
-            category=RiskCategory.MANUAL,
-            factors=[RiskFactor(
-                name="evaluation_error",
-                category="error",
-                raw_score=70,
-                weighted_score=70,
-                weight=1.0,
-                details=str(e)
-            )],
-            recommendation="評估失敗，需要人工審批",
-            parsed_command=None,
-        )
-        return ApprovalDecision(
-            decision=ApprovalDecision.NEEDS_APPROVAL,
-            risk_result=fallback_result,
-            sequence_modifier=0.0,
-            final_score=70,
-            reason=f"風險評估失敗: {e}",
-        )
+        return _fallback_decision(e)
+
+
+def evaluate_commands(
+    commands: list[str],
+    reason: str,
+    source: str,
+    account_id: str,
+    enable_sequence_analysis: bool = True,
+) -> list[ApprovalDecision]:
+    """
+    批次評估多個命令（grant 預檢、&& 串接分析）
+
+    透過 calculate_risk_many 共用規則、解析結果與上下文/帳號分數；
+    每個命令的決策規則與 evaluate_command 相同。
+
+    Returns:
+        與 commands 順序相同的 ApprovalDecision 列表
+    """
+    try:
+        risk_results = calculate_risk_many(commands, reason, source, account_id)
+    except Exception as e:  # noqa: BLE001
+        return [_fallback_decision(e) for _ in commands]
+
+    decisions = []
+    for command, risk_result in zip(commands, risk_results):
+        try:
+            decisions.append(_decide(command, source, risk_result, enable_sequence_analysis))
+        except Exception as e:  # noqa: BLE001
+            decisions.append(_fallback_decision(e))
+    return decisions
+
+
+def _decide(
+    command: str,
+    source: str,
+    risk_result: RiskResult,
+    enable_sequence_analysis: bool,
+) -> ApprovalDecision:
+    """根據風險結果（加上可選的序列修正）決定審批流程"""
+    base_score = risk_result.score
+
+    # Step 2: 序列分析修正（可選）
+    sequence_modifier = 0.0
+    if enable_sequence_analysis:
+        try:
+            sequence_modifier, _seq_reason = get_sequence_risk_modifier(source, command)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Sequence analysis failed: %s", e, extra={"src_module": "smart_approval", "operation": "evaluate_command", "error": str(e)})
+            # 序列分析失敗不影響主流程
+
+    # Step 3: 計算最終分數（加入序列修正）
+    # sequence_modifier 是 -0.3 到 +0.3 的修正值
+    final_score = int(base_score * (1 + sequence_modifier))
+    final_score = max(0, min(100, final_score))  # 確保在 0-100
+
+    # Step 4: 根據分數決定審批流程
+    if risk_result.category == RiskCategory.BLOCK or final_score >= 86:
+        decision = ApprovalDecision.BLOCKED
+        reason_text = f"風險分數 {final_score} >= 86，自動拒絕"
+    elif final_score <= 25:
+        decision = ApprovalDecision.AUTO_APPROVE
+        reason_text = f"風險分數 {final_score} <= 25，自動批准"
+    elif final_score <= 45:
+        decision = ApprovalDecision.NEEDS_CONFIRMATION
+        reason_text = f"風險分數 {final_score}，需要確認（中等風險）"
+    elif final_score <= 65:
+        decision = ApprovalDecision.NEEDS_CONFIRMATION
+        reason_text = f"風險分數 {final_score}，需要確認 reason"
+    else:
+        decision = ApprovalDecision.NEEDS_APPROVAL
+        reason_text = f"風險分數 {final_score}，需要人工審批"
+
+    # Emit metrics for monitoring
+    emit_metric('Bouncer', 'SmartApprovalDecision', 1,
+                dimensions=[{'Name': 'Decision', 'Value': decision}])
+    emit_metric('Bouncer', 'SmartApprovalScore', final_score)
+
+    return ApprovalDecision(
+        decision=decision,
+        risk_result=risk_result,
+        sequence_modifier=sequence_modifier,
+        final_score=final_score,
+        reason=reason_text,
+    )
+
+
+def _fallback_decision(e: Exception) -> ApprovalDecision:
+    """評估失敗時的 fail-closed 決策（需人工審批）"""
+    logger.exception("Risk evaluation failed: %s", e, extra={"src_module": "smart_approval", "operation": "evaluate_command", "error": str(e)})
+    emit_metric('Bouncer', 'SmartApprovalError', 1)
+    fallback_result = RiskResult(
+        score=70,
+        category=RiskCategory.MANUAL,
+        factors=[RiskFactor(
+            name="evaluation_error",
+            category="error",
+            raw_score=70,
+            weighted_score=70,
+            weight=1.0,
+            details=str(e)
+        )],
+        recommendation="評估失敗，需要人工審批",
+        parsed_command=None,
+    )
+    return ApprovalDecision(
+        decision=ApprovalDecision.NEEDS_APPROVAL,
+        risk_result=fallback_result,
+        sequence_modifier=0.0,
+        final_score=70,
+        reason=f"風險評估失敗: {e}",
+    )
 
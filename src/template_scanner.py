@@ -28,6 +28,7 @@ from typing import Any, Optional
 from aws_lambda_powertools import Logger
 from metrics import emit_metric
 from utils import RiskFactor
+from parsed_command import get_parsed_command
 
 # Read env directly (not via constants) to avoid test-isolation issues.
 # See #358 for the underlying sys.modules mess.
@@ -89,10 +90,19 @@ def extract_json_payloads(command: str) -> tuple[list[tuple[str, dict]], bool]:
         (results, extraction_failed) tuple:
         - results: list of (param_name, parsed_json) tuples
         - extraction_failed: True if extraction encountered errors (fail-closed, s61-001)
+
+    Note:
+        成功的抽取結果經 ParsedCommandCache 共用，payload 物件請視為唯讀
     """
     if not command or not isinstance(command, str):
         return ([], False)
 
+    payloads, extraction_failed = get_parsed_command(command).json_payloads
+    return (list(payloads), extraction_failed)
+
+
+def _extract_all_payloads(command: str) -> tuple[list[tuple[str, dict]], bool]:
+    """extract_json_payloads 的實作（由 ParsedCommandCache 呼叫，不經快取）"""
     results = []
     extraction_failed = False
 
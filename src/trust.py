@@ -175,6 +175,7 @@ def get_trust_session(
     trust_scope: str,
     account_id: str,
     source: str = '',
+    snapshot: Optional[_db.PrefetchSnapshot] = None,
 ) -> Optional[dict]:
     """Query for an active trust session, validating source binding.
 
@@ -184,6 +185,7 @@ def get_trust_session(
         source:      Caller source string — must match ``bound_source`` stored at
                      creation time.  Empty/None source is allowed for legacy callers
                      (treated as unknown — session must itself be legacy).
+        snapshot:    Optional execute-pipeline prefetch to serve the read from.
 
     Returns:
         Raw trust session dict (for backward compatibility), or ``None`` when:
@@ -197,7 +199,7 @@ def get_trust_session(
     now = int(time.time())
 
     try:
-        response = _get_table().get_item(Key={'request_id': trust_id})
+        response = _db.read_item(_get_table(), {'request_id': trust_id}, snapshot)
         item = response.get('Item')
 
         if not item:
@@ -471,6 +473,7 @@ def should_trust_approve(
     account_id: str,
     source: str = '',
     caller_ip: str = '',
+    snapshot: Optional[_db.PrefetchSnapshot] = None,
 ) -> tuple:
     """Check whether a command should be auto-approved via trust session.
 
@@ -485,6 +488,7 @@ def should_trust_approve(
                      session is NOT blocked (IP mismatch is informational only,
                      because Telegram callbacks and MCP calls have different IPs
                      by design).
+        snapshot:    Optional execute-pipeline prefetch (see ``get_trust_session``).
 
     Returns:
         (should_approve: bool, trust_session: dict or None, reason: str)
@@ -492,7 +496,7 @@ def should_trust_approve(
     if not TRUST_SESSION_ENABLED or not trust_scope:
         return False, None, "Trust session disabled or no trust_scope"
 
-    session = get_trust_session(trust_scope, account_id, source=source)
+    session = get_trust_session(trust_scope, account_id, source=source, snapshot=snapshot)
     if not session:
         return False, None, "No active trust session"
 
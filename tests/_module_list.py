@@ -23,7 +23,7 @@ BOUNCER_MODS = [
     'mcp_execute', 'execute_context', 'execute_pipeline', 'execute_helpers', 'telegram', 'commands',
     'mcp_upload', 'mcp_admin', 'mcp_grant', 'mcp_history', 'mcp_confirm',
     'mcp_presigned', 'accounts', 'rate_limit', 'utils',
-    'paging', 'smart_approval', 'risk_scorer', 'template_scanner',
+    'paging', 'smart_approval', 'risk_scorer', 'template_scanner', 'parsed_command',
     'scheduler_service', 'compliance_checker', 'grant', 'deployer',
     'deploy_db', 'deploy_preflight',
     'constants', 'metrics', 'sequence_analyzer', 'help_command',
@@ -358,6 +358,20 @@ def _cleanup_tables(request):
 # Mock Pollution Prevention (Sprint 20 #92)
 # ============================================================================
 
+@pytest.fixture(autouse=True)
+def reset_parse_cache():
+    """Clear the shared ParsedCommandCache before each test.
+
+    Cached parses would otherwise bypass tests that patch a module's parse
+    helpers (e.g. template_scanner._extract_param_json) for a command string
+    that an earlier test already parsed.
+    """
+    mod = sys.modules.get('parsed_command')
+    if mod is not None:
+        mod.get_parse_cache().clear()
+    yield
+
+
 @pytest.fixture(autouse=True)
 def reset_paging_module_bindings():
     """Reset paging module function bindings after each test.
@@ -0,0 +1,245 @@
+"""
+Bouncer - Compiled Command Classifier Tests
+
+1. 等價性：CommandClassifier 與原本逐條線性比對的實作逐一比對 verdict
+2. Micro-benchmark：以數千條真實 AWS CLI 命令量測每條命令的分類延遲
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from commands import (  # noqa: E402
+    CommandClassifier,
+    CommandVerdict,
+    classify_command,
+    get_block_reason,
+    is_auto_approve,
+    is_dangerous,
+    check_lambda_env_update,
+    _is_safe_s3_cp,
+)
+from constants import BLOCKED_PATTERNS, DANGEROUS_PATTERNS, AUTO_APPROVE_PREFIXES  # noqa: E402
+
+_OPERATIONS_FILE = Path(__file__).parent.parent / 'data' / 'aws-operations.json'
+
+
+# ============================================================================
+# Reference implementation（分類器引入前的線性版本）
+# ============================================================================
+
+def _ref_normalize(command):
+    return re.sub(r'\s+', ' ', command).strip()
+
+
+def _ref_lambda_env(command):
+    cmd_lower = _ref_normalize(command).lower()
+    if 'lambda update-function-configuration' not in cmd_lower:
+        return None, None
+    if '--environment' not in cmd_lower:
+        return None, None
+    match = re.search(r'variables\s*=\s*(\{[^}]*\})', cmd_lower)
+    if match:
+        value = match.group(1).strip()
+        if value == '{}' or re.match(r'^\{\s*\}$', value):
+            return 'BLOCKED', '此命令會清空所有環境變數（Variables={}）！這是破壞性操作，已被封鎖。'
+        return 'DANGEROUS', '⚠️ 此命令會覆蓋所有環境變數！請確認已備份現有設定。'
+    return None, None
+
+
+def _ref_block_reason(command):
+    cmd_normalized = _ref_normalize(command)
+    cmd_sanitized = re.sub(r"--query\s+['\"].*?['\"]", "--query REDACTED", cmd_normalized)
+    cmd_sanitized = re.sub(r"--query\s+[^\s'\"]+", "--query REDACTED", cmd_sanitized)
+    cmd_lower = cmd_sanitized.lower()
+    for flag in ['--endpoint-url ', '--profile ', '--no-verify-ssl', '--ca-bundle ']:
+        if flag in cmd_lower:
+            return f"危險旗標: {flag.strip()}"
+    if 'file://' in cmd_lower or 'fileb://' in cmd_lower:
+        if not ('--cli-input-json' in cmd_lower and 'file://' in cmd_lower):
+            return "禁止使用 file:// 或 fileb:// 協議（本地檔案讀取風險）"
+    level, reason = _ref_lambda_env(command)
+    if level == 'BLOCKED':
+        return reason
+    for pattern in BLOCKED_PATTERNS:
+        if pattern in cmd_lower:
+            return f"封鎖規則: {pattern}"
+    return None
+
+
+def _ref_is_dangerous(command):
+    cmd_lower = _ref_normalize(command).lower()
+    if _ref_lambda_env(command)[0] == 'DANGEROUS':
+        return True
+    return any(p in cmd_lower for p in DANGEROUS_PATTERNS)
+
+
+def _ref_is_auto_approve(command):
+    cmd_lower = _ref_normalize(command).lower()
+    if not any(cmd_lower.startswith(p) for p in AUTO_APPROVE_PREFIXES):
+        return False
+    if cmd_lower.startswith('aws s3 cp s3:'):
+        return _is_safe_s3_cp(command)
+    if cmd_lower.startswith('aws ssm get-parameter') and '--with-decryption' in cmd_lower:
+        return False
+    return True
+
+
+# ============================================================================
+# Corpus
+# ============================================================================
+
+def _kebab(operation):
+    return re.sub(r'(?<!^)(?=[A-Z])', '-', operation).lower()
+
+
+def _build_corpus():
+    """從 data/aws-operations.json（botocore 操作清單）產生命令語料。"""
+    base = []
+    data = json.loads(_OPERATIONS_FILE.read_text(encoding='utf-8'))
+    for service, info in data['services'].items():
+        for op in info['operations']:
+            base.append(f'aws {service} {_kebab(op)}')
+    base.extend(AUTO_APPROVE_PREFIXES)
+    base.extend(f'aws {p}' for p in BLOCKED_PATTERNS + DANGEROUS_PATTERNS)
+
+    corpus = []
+    for cmd in base:
+        corpus.append(cmd)
+        corpus.append(f'{cmd} --region us-east-1 --output json')
+    # 特殊語法：--query / 旗標 / file:// / 空白 / 大小寫
+    for cmd in base[::4]:
+        corpus.append(f"{cmd} --query 'Items[?name==`iam delete-user`]'")
+        corpus.append(f'{cmd} --query Reservations[].Instances[]')
+        corpus.append(f'{cmd}   --profile   prod')
+        corpus.append(f'{cmd} --endpoint-url https://evil.example.com')
+        corpus.append(f'{cmd} --cli-input-json file:///tmp/in.json')
+        corpus.append(f'{cmd} --body fileb:///etc/passwd')
+        corpus.append(f'  {cmd.upper()}\t--No-Verify-SSL ')
+    corpus.extend([
+        'aws lambda update-function-configuration --function-name f --environment Variables={}',
+        'aws lambda update-function-configuration --function-name f --environment "Variables={ }"',
+        'aws lambda update-function-configuration --function-name f --environment Variables={A=1}',
+        'aws lambda update-function-configuration --function-name f --timeout 30',
+        'aws s3 cp s3://bucket/key /tmp/key',
+        'aws s3 cp s3://bucket/key s3://other/key',
+        'aws s3 cp s3://bucket/key',
+        'aws ssm get-parameter --name /db/pass --with-decryption',
+        'aws ssm get-parameters --names a b',
+        'aws ec2 describe-instances && aws iam delete-user --user-name x',
+        '',
+        '   ',
+        'ls -la',
+    ])
+    return corpus
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return _build_corpus()
+
+
+# ============================================================================
+# Equivalence
+# ============================================================================
+
+class TestClassifierEquivalence:
+    """CommandClassifier 必須與線性版本 verdict-for-verdict 相同"""
+
+    def test_corpus_size(self, corpus):
+        assert len(corpus) >= 3000
+
+    def test_block_reason_equivalent(self, corpus):
+        classifier = CommandClassifier()
+        for cmd in corpus:
+            assert classifier.classify(cmd).block_reason == _ref_block_reason(cmd), cmd
+
+    def test_dangerous_equivalent(self, corpus):
+        classifier = CommandClassifier()
+        for cmd in corpus:
+            assert classifier.classify(cmd).dangerous == _ref_is_dangerous(cmd), cmd
+
+    def test_auto_approve_equivalent(self, corpus):
+        classifier = CommandClassifier()
+        for cmd in corpus:
+            assert classifier.classify(cmd).auto_approve == _ref_is_auto_approve(cmd), cmd
+
+    def test_lambda_env_equivalent(self, corpus):
+        classifier = CommandClassifier()
+        for cmd in corpus:
+            v = classifier.classify(cmd)
+            assert (v.lambda_env_level, v.lambda_env_message) == _ref_lambda_env(cmd), cmd
+
+    def test_public_functions_use_classifier(self, corpus):
+        for cmd in corpus[::7]:
+            assert get_block_reason(cmd) == _ref_block_reason(cmd)
+            assert is_dangerous(cmd) == _ref_is_dangerous(cmd)
+            assert is_auto_approve(cmd) == _ref_is_auto_approve(cmd)
+            assert check_lambda_env_update(cmd) == _ref_lambda_env(cmd)
+
+    def test_first_blocked_pattern_in_list_order_wins(self):
+        classifier = CommandClassifier(blocked_patterns=['b', 'a'], dangerous_patterns=[],
+                                       auto_approve_prefixes=[])
+        assert classifier.classify('xa xb').block_reason == '封鎖規則: b'
+
+    def test_empty_prefix_list_never_auto_approves(self):
+        classifier = CommandClassifier(auto_approve_prefixes=[])
+        assert classifier.classify('aws s3 ls').auto_approve is False
+
+
+class TestClassifyCommandCache:
+    """classify_command 在同一 container 內重用 verdict"""
+
+    def test_returns_verdict(self):
+        verdict = classify_command('aws iam create-user --user-name x')
+        assert isinstance(verdict, CommandVerdict)
+        assert verdict.blocked is True
+        assert verdict.auto_approve is False
+
+    def test_repeated_lookup_hits_cache(self):
+        cmd = 'aws ec2 describe-instances --instance-ids i-cache-test'
+        classify_command(cmd)
+        hits_before = classify_command.cache_info().hits
+        get_block_reason(cmd)
+        is_auto_approve(cmd)
+        is_dangerous(cmd)
+        assert classify_command.cache_info().hits == hits_before + 3
+
+
+# ============================================================================
+# Micro-benchmark
+# ============================================================================
+
+class TestClassifierPerformance:
+    """每條命令分類延遲（CI 容忍值）"""
+
+    def _per_command_us(self, fn, corpus, rounds=3):
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for cmd in corpus:
+                fn(cmd)
+            best = min(best, time.perf_counter() - start)
+        return best / len(corpus) * 1_000_000
+
+    def test_per_command_latency(self, corpus):
+        classifier = CommandClassifier()
+        compiled_us = self._per_command_us(classifier.classify, corpus)
+
+        def reference(cmd):
+            _ref_block_reason(cmd)
+            _ref_is_dangerous(cmd)
+            _ref_is_auto_approve(cmd)
+
+        reference_us = self._per_command_us(reference, corpus)
+        print(f"\n[classifier] corpus={len(corpus)} compiled={compiled_us:.1f}us/cmd "
+              f"reference={reference_us:.1f}us/cmd speedup={reference_us / compiled_us:.1f}x")
+
+        assert compiled_us < 200, f"{compiled_us:.1f}us per command"
+        assert compiled_us < reference_us
@@ -0,0 +1,195 @@
+"""
+tests/test_execute_prefetch.py — execute pipeline 單次 BatchGetItem 預取
+
+Covers:
+- db.batch_prefetch / PrefetchSnapshot: hit, miss, fallback, dedupe, failure
+- execute_pipeline._prefetch_state: collects account / agent key / grant /
+  trust / silent_sources keys in one call and skips warm-cached config
+- readers (get_account, get_grant_session, get_trust_session, get_config,
+  identify_agent) served from the snapshot without a get_item round trip
+"""
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture
+def prefetch_env(monkeypatch):
+    """requests / accounts / config tables in moto, fresh modules."""
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('DEFAULT_ACCOUNT_ID', '111111111111')
+    monkeypatch.setenv('TABLE_NAME', 'clawdbot-approval-requests')
+    monkeypatch.setenv('ACCOUNTS_TABLE_NAME', 'bouncer-accounts')
+    monkeypatch.setenv('CONFIG_TABLE', 'bouncer-config')
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        for name, pk in (
+            ('clawdbot-approval-requests', 'request_id'),
+            ('bouncer-accounts', 'account_id'),
+            ('bouncer-config', 'config_key'),
+        ):
+            dynamodb.create_table(
+                TableName=name,
+                KeySchema=[{'AttributeName': pk, 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': pk, 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST',
+            )
+        for mod in list(sys.modules):
+            if mod in ('db', 'constants', 'config_store', 'agent_keys', 'accounts',
+                       'trust', 'grant', 'execute_pipeline', 'execute_context'):
+                del sys.modules[mod]
+        import db
+        db.reset_tables()
+        yield dynamodb
+        db.reset_tables()
+
+
+class TestBatchPrefetch:
+
+    def test_hit_and_miss_are_both_recorded(self, prefetch_env):
+        import db
+        db.table.put_item(Item={'request_id': 'grant-1', 'type': 'grant_session'})
+
+        snap = db.batch_prefetch([
+            (db.table, {'request_id': 'grant-1'}),
+            (db.table, {'request_id': 'missing'}),
+        ])
+
+        assert len(snap) == 2
+        assert snap.get_item(db.table, {'request_id': 'grant-1'})['Item']['type'] == 'grant_session'
+        assert snap.get_item(db.table, {'request_id': 'missing'}) == {}
+
+    def test_duplicate_keys_collapsed(self, prefetch_env):
+        import db
+        snap = db.batch_prefetch([
+            (db.accounts_table, {'account_id': '111111111111'}),
+            (db.accounts_table, {'account_id': '111111111111'}),
+        ])
+        assert len(snap) == 1
+
+    def test_unfetched_key_falls_back_to_get_item(self, prefetch_env):
+        import db
+        db.table.put_item(Item={'request_id': 'later'})
+        snap = db.batch_prefetch([])
+        assert snap.get_item(db.table, {'request_id': 'later'})['Item']['request_id'] == 'later'
+
+    def test_failure_returns_empty_snapshot(self, prefetch_env):
+        import db
+        with patch.object(db, '_get_resource', side_effect=RuntimeError('boom')):
+            snap = db.batch_prefetch([(db.table, {'request_id': 'x'})])
+        assert len(snap) == 0
+
+    def test_unprocessed_keys_retried(self, prefetch_env):
+        import db
+        db.table.put_item(Item={'request_id': 'a'})
+        real = db._get_resource()
+        calls = []
+
+        def _flaky(RequestItems):
+            calls.append(RequestItems)
+            if len(calls) == 1:
+                return {'Responses': {}, 'UnprocessedKeys': RequestItems}
+            return real.batch_get_item(RequestItems=RequestItems)
+
+        fake = MagicMock()
+        fake.batch_get_item.side_effect = _flaky
+        with patch.object(db, '_get_resource', return_value=fake):
+            snap = db.batch_prefetch([(db.table, {'request_id': 'a'})])
+        assert len(calls) == 2
+        assert snap.get_item(db.table, {'request_id': 'a'})['Item'] == {'request_id': 'a'}
+
+    def test_non_table_refs_skipped(self, prefetch_env):
+        import db
+        snap = db.batch_prefetch([(MagicMock(), {'request_id': 'x'})])
+        assert len(snap) == 0
+
+
+class TestPrefetchState:
+
+    def _seed(self, dynamodb):
+        import trust
+        from agent_keys import _hash_key
+        now = int(time.time())
+        dynamodb.Table('bouncer-accounts').put_item(Item={
+            'account_id': '111111111111', 'name': 'Default', 'enabled': True,
+        })
+        dynamodb.Table('bouncer-accounts').put_item(Item={
+            'account_id': '222222222222', 'name': 'Dev', 'enabled': True,
+            'role_arn': 'arn:aws:iam::222222222222:role/BouncerRole',
+        })
+        dynamodb.Table('bouncer-config').put_item(Item={
+            'config_key': f"agent_key#{_hash_key('bncr_test_key')}",
+            'agent_id': 'bot', 'agent_name': 'Bot', 'last_used_at': now,
+        })
+        dynamodb.Table('bouncer-config').put_item(Item={
+            'config_key': 'silent_sources', 'value': ['Bot*'],
+        })
+        dynamodb.Table('clawdbot-approval-requests').put_item(Item={
+            'request_id': 'grant-1', 'type': 'grant_session', 'status': 'active',
+        })
+        dynamodb.Table('clawdbot-approval-requests').put_item(Item={
+            'request_id': trust._compute_trust_id('scope-a', '222222222222'),
+            'type': 'trust_session', 'expires_at': now + 600, 'bound_source': 'Bot',
+        })
+
+    def test_collects_all_pipeline_keys_in_one_call(self, prefetch_env):
+        import db
+        import execute_pipeline
+        self._seed(prefetch_env)
+        real = db._get_resource()
+        with patch.object(db, '_get_resource', wraps=lambda: real) as get_res:
+            snap = execute_pipeline._prefetch_state(
+                account_id='222222222222', trust_scope='scope-a',
+                grant_id='grant-1', bouncer_key='bncr_test_key',
+            )
+        assert get_res.call_count == 1
+        # default + target account, agent key, silent_sources, grant, trust
+        assert len(snap) == 6
+
+    def test_readers_served_from_snapshot(self, prefetch_env):
+        import accounts
+        import agent_keys
+        import config_store
+        import execute_pipeline
+        import grant
+        import trust
+        self._seed(prefetch_env)
+        snap = execute_pipeline._prefetch_state(
+            account_id='222222222222', trust_scope='scope-a',
+            grant_id='grant-1', bouncer_key='bncr_test_key',
+        )
+
+        def _no_get_item(*args, **kwargs):
+            raise AssertionError('get_item should be served from snapshot')
+
+        with patch.object(accounts._get_accounts_table(), 'get_item', _no_get_item), \
+             patch.object(config_store._get_table(), 'get_item', _no_get_item), \
+             patch.object(trust._get_table(), 'get_item', _no_get_item):
+            assert accounts.get_account('222222222222', snap)['name'] == 'Dev'
+            assert grant.get_grant_session('grant-1', snapshot=snap)['status'] == 'active'
+            assert trust.get_trust_session('scope-a', '222222222222', source='Bot', snapshot=snap)
+            assert agent_keys.identify_agent('bncr_test_key', snapshot=snap)['agent_id'] == 'bot'
+            assert config_store._is_silent_source('Bot-1', snapshot=snap) is True
+
+    def test_cached_config_and_agent_key_skipped(self, prefetch_env):
+        import agent_keys
+        import config_store
+        import execute_pipeline
+        self._seed(prefetch_env)
+        config_store.get_config('silent_sources')
+        agent_keys.identify_agent('bncr_test_key')
+
+        snap = execute_pipeline._prefetch_state(
+            account_id='222222222222', trust_scope='', bouncer_key='bncr_test_key',
+        )
+        # default + target account only
+        assert len(snap) == 2
+        config_store._cache.clear()
+        agent_keys._key_cache.clear()
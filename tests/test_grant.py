@@ -372,6 +372,34 @@ class TestPrecheckCategories:
         assert result['summary']['blocked'] == 1
 
 
+    def test_risk_scored_in_one_batch(self, grant_module):
+        """grantable 命令以 calculate_risk_many 一次評分，blocked 命令不評分"""
+        high = MagicMock(score=80)
+        low = MagicMock(score=10)
+        with patch.object(grant_module, 'calculate_risk_many', return_value=[low, high]) as mock_many, \
+                patch.object(grant_module, 'calculate_risk') as mock_single:
+            result = grant_module.create_grant_request(
+                commands=['aws s3 ls', 'aws iam create-user --user-name hacker', 'aws ec2 run-instances'],
+                reason='test', source='Bot', account_id='111111111111',
+            )
+        mock_single.assert_not_called()
+        mock_many.assert_called_once()
+        assert mock_many.call_args.args[0] == ['aws s3 ls', 'aws ec2 run-instances']
+        details = result['commands_detail']
+        assert [d['category'] for d in details] == ['grantable', 'blocked', 'requires_individual']
+        assert details[2]['risk_score'] == 80
+
+    def test_batch_scoring_error_fails_open(self, grant_module):
+        """批次評分失敗 → 視為 grantable（與單筆行為相同）"""
+        with patch.object(grant_module, 'calculate_risk_many', side_effect=RuntimeError('boom')):
+            result = grant_module.create_grant_request(
+                commands=['aws s3 ls', 'aws ec2 describe-instances'],
+                reason='test', source='Bot', account_id='111111111111',
+            )
+        assert result['summary']['grantable'] == 2
+        assert all(d['risk_score'] == 0 for d in result['commands_detail'])
+
+
 # ============================================================================
 # approve_grant Tests
 # ============================================================================
@@ -0,0 +1,228 @@
+"""
+Bouncer - ParsedCommandCache Tests
+
+1. 各層級（normalize / split / parse / resource ids / payloads）共用同一份解析結果
+2. LRU 上限、長命令 bypass、命中率統計
+3. 快取結果與未快取實作一致，且回傳值不會污染快取
+"""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import parsed_command  # noqa: E402
+from parsed_command import CommandParse, ParsedCommandCache, get_parse_cache, get_parsed_command  # noqa: E402
+
+import commands  # noqa: E402
+import execute_context  # noqa: E402
+import grant  # noqa: E402
+import risk_scorer  # noqa: E402
+import sequence_analyzer  # noqa: E402
+import template_scanner  # noqa: E402
+
+
+_COMMANDS = [
+    'aws ec2 describe-instances --instance-ids i-1234567890abcdef0 --region us-east-1',
+    'aws s3 cp s3://bucket/key /tmp/key',
+    "aws iam put-role-policy --role-name r --policy-name p "
+    "--policy-document '{\"Statement\":[{\"Effect\":\"Allow\",\"Action\":\"*\",\"Resource\":\"*\"}]}'",
+    'aws lambda update-function-configuration --function-name f --environment Variables={A=1}',
+    "aws logs filter-log-events --log-group-name /aws/lambda/x --query 'events[?x==`a b`]'",
+    'aws dynamodb get-item --table-name t --key {"pk":{"S":"a b"}}',
+    'aws  sts   get-caller-identity',
+    'aws',
+    '',
+]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    get_parse_cache().clear()
+    yield
+    get_parse_cache().clear()
+
+
+class TestSharedParse:
+    """所有層級共用同一個 CommandParse"""
+
+    def test_same_entry_for_same_command(self):
+        cmd = _COMMANDS[0]
+        assert get_parsed_command(cmd) is get_parsed_command(cmd)
+
+    def test_layers_hit_cache(self):
+        cmd = _COMMANDS[0]
+        execute_context._normalize_command(cmd)
+        commands.aws_cli_split(cmd)
+        risk_scorer.parse_command(cmd)
+        sequence_analyzer.parse_action_from_command(cmd)
+        sequence_analyzer.extract_resource_ids(cmd)
+        grant.normalize_command(cmd)
+        template_scanner.extract_json_payloads(cmd)
+
+        stats = get_parse_cache().stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 6
+        assert stats['size'] == 1
+        assert stats['hit_rate'] == pytest.approx(6 / 7, abs=1e-4)
+
+    def test_fields_computed_once(self):
+        cmd = _COMMANDS[0]
+        with patch.object(commands, '_split_aws_cli', wraps=commands._split_aws_cli) as split:
+            for _ in range(5):
+                commands.aws_cli_split(cmd)
+        assert split.call_count == 1
+
+    def test_representation_fields(self):
+        entry = get_parsed_command(_COMMANDS[0])
+        assert isinstance(entry, CommandParse)
+        assert entry.tokens[:3] == ('aws', 'ec2', 'describe-instances')
+        assert (entry.service, entry.action) == ('ec2', 'describe-instances')
+        assert entry.params['region'] == 'us-east-1'
+        assert entry.resource_ids == ('i-1234567890abcdef0',)
+        assert entry.json_payloads == ((), False)
+
+
+class TestEquivalence:
+    """快取結果必須與未快取實作相同"""
+
+    @pytest.mark.parametrize('cmd', _COMMANDS)
+    def test_matches_uncached(self, cmd):
+        assert commands.aws_cli_split(cmd) == commands._split_aws_cli(cmd)
+        assert risk_scorer.parse_command(cmd) == risk_scorer._parse_aws_command(cmd)
+        assert sequence_analyzer.parse_action_from_command(cmd) == sequence_analyzer._parse_service_action(cmd)
+        assert sorted(sequence_analyzer.extract_resource_ids(cmd)) == sorted(sequence_analyzer._scan_resource_ids(cmd))
+        assert grant.normalize_command(cmd) == grant._normalize_for_match(cmd)
+        if cmd:
+            assert execute_context._normalize_command(cmd) == execute_context._normalize_unicode(cmd)
+            assert template_scanner.extract_json_payloads(cmd) == template_scanner._extract_all_payloads(cmd)
+
+    def test_unicode_normalization_still_applied(self):
+        assert execute_context._normalize_command('aws​ s3   ls ') == 'aws s3 ls'
+
+    def test_non_string_inputs(self):
+        assert grant.normalize_command(None) == ''
+        assert risk_scorer.parse_command(None).is_valid is False
+        assert template_scanner.extract_json_payloads(None) == ([], False)
+
+
+class TestImmutability:
+    """回傳值是副本，修改不影響快取"""
+
+    def test_split_returns_copy(self):
+        cmd = _COMMANDS[0]
+        argv = commands.aws_cli_split(cmd)
+        argv.append('--debug')
+        assert '--debug' not in commands.aws_cli_split(cmd)
+
+    def test_parse_command_returns_copy(self):
+        cmd = _COMMANDS[0]
+        parsed = risk_scorer.parse_command(cmd)
+        parsed.parameters['region'] = 'evil'
+        parsed.flags.append('--force')
+        fresh = risk_scorer.parse_command(cmd)
+        assert fresh.parameters['region'] == 'us-east-1'
+        assert '--force' not in fresh.flags
+
+    def test_params_read_only(self):
+        entry = get_parsed_command(_COMMANDS[0])
+        with pytest.raises(TypeError):
+            entry.params['region'] = 'x'
+
+    def test_frozen(self):
+        entry = get_parsed_command(_COMMANDS[0])
+        with pytest.raises(Exception):
+            entry.raw = 'aws s3 ls'
+
+    def test_extraction_failure_not_cached(self):
+        """fail-closed (s61-001)：抽取失敗的結果不可被快取"""
+        cmd = _COMMANDS[2]
+        original = template_scanner._extract_param_json
+
+        def failing(command, param):
+            raise ValueError('boom')
+
+        with patch.object(template_scanner, '_extract_param_json', side_effect=failing):
+            _, failed = template_scanner.extract_json_payloads(cmd)
+        assert failed is True
+
+        assert template_scanner._extract_param_json is original
+        payloads, failed = template_scanner.extract_json_payloads(cmd)
+        assert failed is False
+        assert payloads and payloads[0][0] == '--policy-document'
+
+
+class TestLRU:
+    """Bounded LRU 行為"""
+
+    def test_evicts_least_recently_used(self):
+        cache = ParsedCommandCache(max_entries=2)
+        a = cache.get('aws s3 ls')
+        cache.get('aws ec2 describe-vpcs')
+        assert cache.get('aws s3 ls') is a  # a 變成最近使用
+        cache.get('aws sts get-caller-identity')  # 淘汰 describe-vpcs
+        assert len(cache) == 2
+        assert cache.get('aws s3 ls') is a
+        cache.get('aws ec2 describe-vpcs')
+        assert cache.stats()['misses'] == 4
+
+    def test_long_command_bypasses_cache(self):
+        cache = ParsedCommandCache(max_entries=4, max_command_length=32)
+        long_cmd = 'aws s3 ls ' + 'x' * 64
+        entry = cache.get(long_cmd)
+        assert entry.raw == long_cmd
+        assert len(cache) == 0
+        assert cache.stats()['bypasses'] == 1
+
+    def test_hit_rate_empty(self):
+        assert ParsedCommandCache().hit_rate == 0.0
+
+    def test_clear_resets_stats(self):
+        cache = ParsedCommandCache()
+        cache.get('aws s3 ls')
+        cache.get('aws s3 ls')
+        cache.clear()
+        assert cache.stats() == {
+            'hits': 0, 'misses': 0, 'bypasses': 0,
+            'size': 0, 'max_entries': cache.max_entries, 'hit_rate': 0.0,
+        }
+
+    def test_concurrent_access(self):
+        cache = ParsedCommandCache(max_entries=16)
+        cmds = [f'aws s3 ls s3://bucket-{i}' for i in range(32)]
+
+        def worker():
+            for cmd in cmds * 10:
+                assert cache.get(cmd).raw == cmd
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = cache.stats()
+        assert stats['size'] == 16
+        assert stats['hits'] + stats['misses'] == 4 * 10 * 32
+
+
+class TestMetrics:
+    """命中率 metric"""
+
+    def test_emit_hit_rate(self):
+        get_parsed_command('aws s3 ls')
+        get_parsed_command('aws s3 ls')
+        mock_emit = MagicMock()
+        with patch.dict(parsed_command.emit_parse_cache_metrics.__globals__, {'emit_metric': mock_emit}):
+            parsed_command.emit_parse_cache_metrics()
+        mock_emit.assert_any_call('Bouncer', 'ParsedCommandCacheHitRate', 50.0, unit='Percent')
+        mock_emit.assert_any_call('Bouncer', 'ParsedCommandCacheSize', 1)
+
+    def test_emit_never_raises(self):
+        with patch.dict(parsed_command.emit_parse_cache_metrics.__globals__,
+                        {'emit_metric': MagicMock(side_effect=RuntimeError('x'))}):
+            parsed_command.emit_parse_cache_metrics()
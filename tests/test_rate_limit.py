@@ -150,3 +150,142 @@ class TestRateLimitMore:
 
 
 
+
+
+# ============================================================================
+# Counter mode (RATE_LIMIT_MODE='counter')
+# ============================================================================
+
+
+class _CountingTable:
+    """Table proxy recording DynamoDB calls and items read by queries."""
+
+    def __init__(self, table):
+        self._table = table
+        self.calls = 0
+        self.scanned = 0
+
+    def update_item(self, **kwargs):
+        self.calls += 1
+        return self._table.update_item(**kwargs)
+
+    def query(self, **kwargs):
+        self.calls += 1
+        response = self._table.query(**kwargs)
+        self.scanned += response.get('ScannedCount', 0)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+
+@pytest.fixture
+def counter_limiter(mock_dynamodb, monkeypatch):
+    """rate_limit in counter mode against the moto requests table."""
+    import rate_limit
+    monkeypatch.setattr(rate_limit, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(rate_limit, 'RATE_LIMIT_MODE', 'counter')
+    table = _CountingTable(mock_dynamodb.Table('clawdbot-approval-requests'))
+    monkeypatch.setattr(rate_limit, '_table', table)
+    return rate_limit, table
+
+
+def _seed_history(dynamodb, source, count, created_at, status='approved'):
+    table = dynamodb.Table('clawdbot-approval-requests')
+    with table.batch_writer() as batch:
+        for i in range(count):
+            batch.put_item(Item={
+                'request_id': f'hist-{source}-{created_at}-{i}',
+                'source': source,
+                'status': status,
+                'created_at': created_at,
+            })
+
+
+class TestRateLimitCounterMode:
+    """counter 模式：單次 conditional UpdateItem + 有界 pending 查詢"""
+
+    def test_allows_up_to_max_then_raises(self, counter_limiter):
+        rate_limit, _ = counter_limiter
+        for _ in range(rate_limit.RATE_LIMIT_MAX_REQUESTS):
+            rate_limit.check_rate_limit('counter-src')
+        with pytest.raises(rate_limit.RateLimitExceeded):
+            rate_limit.check_rate_limit('counter-src')
+
+    def test_sources_counted_independently(self, counter_limiter):
+        rate_limit, _ = counter_limiter
+        for _ in range(rate_limit.RATE_LIMIT_MAX_REQUESTS):
+            rate_limit.check_rate_limit('src-a')
+        rate_limit.check_rate_limit('src-b')
+
+    def test_new_window_resets(self, counter_limiter):
+        rate_limit, _ = counter_limiter
+        with patch('rate_limit.time.time', return_value=1_000_020):
+            for _ in range(rate_limit.RATE_LIMIT_MAX_REQUESTS):
+                rate_limit.check_rate_limit('window-src')
+            with pytest.raises(rate_limit.RateLimitExceeded):
+                rate_limit.check_rate_limit('window-src')
+        with patch('rate_limit.time.time', return_value=1_000_020 + rate_limit.RATE_LIMIT_WINDOW):
+            rate_limit.check_rate_limit('window-src')
+
+    def test_counter_item_has_ttl_and_no_gsi_attributes(self, counter_limiter, mock_dynamodb):
+        rate_limit, _ = counter_limiter
+        with patch('rate_limit.time.time', return_value=1_000_020):
+            rate_limit.check_rate_limit('ttl-src')
+        window_index = 1_000_020 // rate_limit.RATE_LIMIT_WINDOW
+        item = mock_dynamodb.Table('clawdbot-approval-requests').get_item(
+            Key={'request_id': f'ratelimit#ttl-src#{window_index}'}
+        )['Item']
+        assert item['hits'] == 1
+        assert item['ttl'] > 1_000_020
+        assert 'source' not in item and 'status' not in item
+
+    def test_pending_limit_still_enforced(self, counter_limiter, mock_dynamodb):
+        rate_limit, _ = counter_limiter
+        _seed_history(mock_dynamodb, 'pending-src', rate_limit.MAX_PENDING_PER_SOURCE,
+                      int(time.time()) - 30, status='pending_approval')
+        with pytest.raises(rate_limit.PendingLimitExceeded):
+            rate_limit.check_rate_limit('pending-src')
+
+    def test_ddb_error_fails_closed(self, counter_limiter):
+        rate_limit, table = counter_limiter
+        from botocore.exceptions import ClientError
+        err = ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'x'}}, 'UpdateItem')
+        with patch.object(table._table, 'update_item', side_effect=err):
+            with pytest.raises(rate_limit.RateLimitExceeded, match='check failed'):
+                rate_limit.check_rate_limit('err-src')
+
+    def test_load_constant_cost_as_history_grows(self, counter_limiter, mock_dynamodb):
+        """Load test: per-check DDB calls / items read stay flat as history grows 10x."""
+        rate_limit, table = counter_limiter
+        old = int(time.time()) - rate_limit.RATE_LIMIT_PENDING_LOOKBACK - 600
+
+        costs = []
+        for history_size in (20, 200):
+            source = f'load-src-{history_size}'
+            _seed_history(mock_dynamodb, source, history_size, old)
+            _seed_history(mock_dynamodb, source, history_size, old, status='pending_approval')
+            table.calls = table.scanned = 0
+            for _ in range(rate_limit.RATE_LIMIT_MAX_REQUESTS):
+                rate_limit.check_rate_limit(source)
+            costs.append((table.calls, table.scanned))
+
+        assert costs[0] == costs[1]
+        # one UpdateItem + one bounded pending Query per check
+        assert costs[0][0] == 2 * rate_limit.RATE_LIMIT_MAX_REQUESTS
+
+    def test_query_mode_cost_grows_with_history(self, counter_limiter, mock_dynamodb, monkeypatch):
+        """Contrast: legacy query mode reads the source's entire pending history."""
+        rate_limit, table = counter_limiter
+        monkeypatch.setattr(rate_limit, 'RATE_LIMIT_MODE', 'query')
+        old = int(time.time()) - 86400
+
+        scanned = []
+        for history_size in (20, 200):
+            source = f'legacy-src-{history_size}'
+            _seed_history(mock_dynamodb, source, history_size, old)
+            table.calls = table.scanned = 0
+            rate_limit.check_rate_limit(source)
+            scanned.append(table.scanned)
+
+        assert scanned[1] > scanned[0]
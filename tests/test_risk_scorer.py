@@ -17,6 +17,7 @@ Author: Bouncer Team
 
 import pytest
 import sys
+from unittest.mock import MagicMock
 from pathlib import Path
 
 # 確保可以 import src
@@ -930,6 +931,133 @@ class TestPerformance:
         assert avg_time < 20, f"Average evaluation time {avg_time}ms should be < 20ms"
 
 
+class TestCalculateRiskMany:
+    """批次評估 calculate_risk_many 測試"""
+
+    def test_same_results_as_single(self, risk_rules, sample_commands):
+        """批次結果與逐一 calculate_risk 相同"""
+        from risk_scorer import calculate_risk_many
+        commands = [c for cmds in sample_commands.values() for c in cmds]
+        batch = calculate_risk_many(commands, reason="Batch", source="Private Bot",
+                                    account_id="111111111111", rules=risk_rules)
+        assert len(batch) == len(commands)
+        for cmd, result in zip(commands, batch):
+            single = calculate_risk(cmd, reason="Batch", source="Private Bot",
+                                    account_id="111111111111", rules=risk_rules)
+            assert result.command == cmd
+            assert result.score == single.score
+            assert result.category == single.category
+            assert [(f.name, f.weighted_score) for f in result.factors] == \
+                [(f.name, f.weighted_score) for f in single.factors]
+
+    def test_shared_context_scored_once(self, risk_rules):
+        """上下文 / 帳號分數整批只計算一次"""
+        from unittest.mock import patch
+        from risk_scorer import calculate_risk_many
+        g = calculate_risk_many.__globals__
+        with patch.dict(g, {'score_context': MagicMock(wraps=g['score_context']),
+                            'score_account': MagicMock(wraps=g['score_account'])}):
+            calculate_risk_many(['aws s3 ls'] * 50, rules=risk_rules)
+            assert g['score_context'].call_count == 1
+            assert g['score_account'].call_count == 1
+
+    def test_factors_not_shared_between_results(self, risk_rules):
+        """每個結果持有獨立的 factor 物件"""
+        from risk_scorer import calculate_risk_many
+        a, b = calculate_risk_many(['aws s3 ls', 'aws ec2 describe-instances'], rules=risk_rules)
+        ctx_a = [f for f in a.factors if f.category == 'context']
+        ctx_b = [f for f in b.factors if f.category == 'context']
+        assert ctx_a and all(x is not y for x, y in zip(ctx_a, ctx_b))
+
+    def test_invalid_command_fails_closed_individually(self, risk_rules):
+        """單一命令失敗不影響其他命令"""
+        from risk_scorer import calculate_risk_many
+        results = calculate_risk_many(['', 'aws s3 ls'], rules=risk_rules)
+        assert results[0].category == RiskCategory.MANUAL
+        assert results[0].score == 70
+        assert results[1].category in (RiskCategory.AUTO_APPROVE, RiskCategory.LOG)
+
+    def test_empty_batch(self, risk_rules):
+        from risk_scorer import calculate_risk_many
+        assert calculate_risk_many([], rules=risk_rules) == []
+
+
+class TestRuleBank:
+    """預編譯 pattern bank 測試"""
+
+    @staticmethod
+    def _many_rules(base, n_params=300, n_blocked=100):
+        rules = create_default_rules()
+        rules.parameter_patterns = list(base.parameter_patterns) + [
+            {'pattern': f'--custom-param-{i}\\s+\\S+', 'score': 40 + i % 50, 'description': f'custom {i}'}
+            for i in range(n_params)
+        ]
+        rules.blocked_patterns = [f'custom{i}\\s+destroy-everything' for i in range(n_blocked)] + \
+            list(base.blocked_patterns)
+        return rules
+
+    def test_bank_matches_per_pattern_search(self, risk_rules, sample_commands):
+        """bank 命中結果與逐條 re.search 相同（含順序）"""
+        import re
+        rules = self._many_rules(risk_rules)
+        bank = rules.get_rule_bank()
+        commands = [c for cmds in sample_commands.values() for c in cmds]
+        commands.append('aws ec2 run-instances --custom-param-7 foo --custom-param-250 bar')
+        for cmd in commands:
+            lower = cmd.lower()
+            expected = [r for r in rules.parameter_patterns if re.search(r['pattern'], lower, re.IGNORECASE)]
+            assert bank.matching_parameters(lower) == expected
+            expected_blocked = next((p for p in rules.blocked_patterns if re.search(p, lower)), None)
+            assert bank.first_blocked(lower) == expected_blocked
+
+    def test_bank_compiled_once_per_rules(self, risk_rules):
+        """同一份規則重複取得 bank 不重新編譯"""
+        assert risk_rules.get_rule_bank() is risk_rules.get_rule_bank()
+
+    def test_bank_rebuilt_after_rule_change(self, risk_rules):
+        """修改 pattern 後 bank 自動重建"""
+        bank = risk_rules.get_rule_bank()
+        risk_rules.parameter_patterns = risk_rules.parameter_patterns + [
+            {'pattern': '--brand-new-flag', 'score': 77, 'description': 'new'}
+        ]
+        assert risk_rules.get_rule_bank() is not bank
+        _, factors = score_parameters(parse_command('aws ec2 run-instances --brand-new-flag'), risk_rules)
+        assert any(f.raw_score == 77 for f in factors)
+
+    def test_invalid_pattern_reported_and_fails_closed(self, risk_rules):
+        """無效 pattern：validate 回報、評分 fail-closed"""
+        risk_rules.parameter_patterns = risk_rules.parameter_patterns + [{'pattern': '([', 'score': 10}]
+        is_valid, errors = risk_rules.validate()
+        assert not is_valid
+        assert any('([' in e for e in errors)
+        result = calculate_risk('aws s3 ls', rules=risk_rules)
+        assert result.category == RiskCategory.MANUAL
+        assert result.score == 70
+
+    def test_hundreds_of_rules_within_budget(self, risk_rules, sample_commands):
+        """數百條自訂規則下 evaluation_time_ms 仍遠低於 50ms 目標"""
+        budget_ms = calculate_risk.__globals__['EVALUATION_BUDGET_MS']
+        rules = self._many_rules(risk_rules)
+        rules.get_rule_bank()
+        times = [
+            calculate_risk(cmd, reason="Budget test", source="test", rules=rules).evaluation_time_ms
+            for cmds in sample_commands.values() for cmd in cmds
+        ]
+        worst = max(times)
+        assert worst < budget_ms / 5, f"worst evaluation {worst:.2f}ms"
+
+    def test_over_budget_emits_metric(self, risk_rules):
+        """超過預算時送出 RiskEvaluationOverBudget"""
+        from unittest.mock import MagicMock, patch
+        mock_emit = MagicMock()
+        # patch the globals calculate_risk actually sees (module may have been re-imported)
+        with patch.dict(calculate_risk.__globals__, {'EVALUATION_BUDGET_MS': -1.0, 'emit_metric': mock_emit}):
+            calculate_risk('aws s3 ls', rules=risk_rules)
+        names = [c.args[1] for c in mock_emit.call_args_list]
+        assert 'RiskEvaluationTime' in names
+        assert 'RiskEvaluationOverBudget' in names
+
+
 class TestRuleValidation:
     """規則驗證測試"""
 
@@ -56,3 +56,39 @@ class TestSmartApproval:
             result = smart_approval.shadow_evaluate('aws s3 ls', 'test-source')
             # Shadow mode should return a decision but not enforce it
             assert result is not None or result is None  # just don't crash
+
+
+class TestEvaluateCommands:
+    """Batch evaluation (evaluate_commands)."""
+
+    COMMANDS = [
+        'aws s3 ls',
+        'aws ec2 terminate-instances --instance-ids i-123',
+        'aws iam create-user --user-name x',
+        'aws s3 ls',
+    ]
+
+    def test_matches_single_evaluation(self):
+        """Each decision equals the one evaluate_command would return."""
+        import smart_approval
+        batch = smart_approval.evaluate_commands(
+            self.COMMANDS, 'batch test', 'test-bot', '111111111111', enable_sequence_analysis=False,
+        )
+        assert len(batch) == len(self.COMMANDS)
+        for cmd, decision in zip(self.COMMANDS, batch):
+            single = smart_approval.evaluate_command(
+                cmd, 'batch test', 'test-bot', '111111111111', enable_sequence_analysis=False,
+            )
+            assert decision.decision == single.decision
+            assert decision.final_score == single.final_score
+
+    def test_fail_closed_on_batch_error(self):
+        """A scoring failure degrades every command to needs_approval."""
+        from unittest.mock import patch
+        import smart_approval
+        with patch.object(smart_approval, 'calculate_risk_many', side_effect=RuntimeError('boom')):
+            batch = smart_approval.evaluate_commands(
+                self.COMMANDS, 'r', 's', 'a', enable_sequence_analysis=False,
+            )
+        assert [d.decision for d in batch] == [smart_approval.ApprovalDecision.NEEDS_APPROVAL] * len(self.COMMANDS)
+        assert all(d.final_score == 70 for d in batch)